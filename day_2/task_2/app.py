@@ -2,7 +2,7 @@ import streamlit as st
 import os
 from dotenv import load_dotenv
 load_dotenv()
-from utils.rag import PolicyAssistant
+from utils.tenants import TenantIndexManager
 from utils.loader import load_document
 import time
 
@@ -14,12 +14,13 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-# Initialize assistant
+# Initialize tenant index manager (one corpus per client company)
 @st.cache_resource
-def init_assistant():
-    return PolicyAssistant()
+def init_manager():
+    max_memory_mb = int(os.getenv("MAX_INDEX_MEMORY_MB", "2048"))
+    return TenantIndexManager(max_memory_bytes=max_memory_mb * 1024 * 1024)
 
-assistant = init_assistant()
+manager = init_manager()
 
 # Custom CSS for styling
 st.markdown("""
@@ -50,26 +51,54 @@ st.markdown("""
 
 # Sidebar - Policy Upload
 st.sidebar.title("📂 Policy Management")
-uploaded_file = st.sidebar.file_uploader(
-    "Upload HR Policy (PDF/DOCX)", 
+tenant = st.sidebar.text_input("Company", value=os.getenv("DEFAULT_TENANT", "default"))
+try:
+    assistant = manager.get(tenant)
+except ValueError as e:
+    st.sidebar.error(str(e))
+    st.stop()
+if assistant.missing_documents:
+    st.sidebar.warning(
+        "Cached data is missing for: " + ", ".join(assistant.missing_documents) + ". Please re-upload them."
+    )
+
+uploaded_files = st.sidebar.file_uploader(
+    "Upload HR Policies (PDF/DOCX)", 
     type=["pdf", "docx"],
-    help="Upload your company HR policy document"
+    accept_multiple_files=True,
+    help="Upload your company HR policy documents",
+    # Keyed by company so switching companies starts from an empty uploader
+    key=f"uploader_{tenant}"
 )
 
-# Load policy if uploaded
-if uploaded_file:
-    # Save to data directory
-    if not os.path.exists("data"):
-        os.makedirs("data")
-    
-    file_path = os.path.join("data", uploaded_file.name)
+# The uploader keeps its files across reruns; ingest each upload only once so
+# removed policies are not re-added on the next rerun
+if "processed_uploads" not in st.session_state:
+    st.session_state.processed_uploads = set()
+
+# Add uploaded policies to the corpus (unchanged documents are not re-embedded)
+for uploaded_file in uploaded_files or []:
+    if (tenant, uploaded_file.file_id) in st.session_state.processed_uploads:
+        continue
+    # Save to the tenant's data directory
+    tenant_data_dir = os.path.join("data", tenant)
+    os.makedirs(tenant_data_dir, exist_ok=True)
+    file_path = os.path.join(tenant_data_dir, uploaded_file.name)
     with open(file_path, "wb") as f:
         f.write(uploaded_file.getbuffer())
     
     # Load policy into assistant
-    with st.spinner("Processing policy document..."):
-        assistant.load_policy(file_path)
-    st.sidebar.success(f"✅ Policy loaded: {uploaded_file.name}")
+    with st.spinner(f"Processing {uploaded_file.name}..."):
+        manager.add_document(tenant, file_path)
+    st.session_state.processed_uploads.add((tenant, uploaded_file.file_id))
+
+# Indexed policies
+for doc in assistant.list_documents():
+    col_name, col_remove = st.sidebar.columns([4, 1])
+    col_name.success(f"✅ {doc['name']} ({doc['sections']} sections)")
+    if col_remove.button("🗑️", key=f"remove_{doc['id']}", help="Remove from index"):
+        manager.remove_document(tenant, doc["id"])
+        st.rerun()
 
 # Main Chat Interface
 st.title("🤖 HR Policy Assistant")
@@ -85,6 +114,8 @@ if "messages" not in st.session_state:
 for message in st.session_state.messages:
     with st.chat_message(message["role"]):
         st.markdown(message["content"])
+        if "metrics" in message:
+            st.caption(message["metrics"])
         
         # Show sources if available
         if "sources" in message:
@@ -109,23 +140,28 @@ if prompt := st.chat_input("Ask about HR policies..."):
         
         with st.spinner("Searching policies..."):
             # Retrieve relevant sections
-            results = assistant.search(prompt)
-            
-            # Format context
-            context = "\n\n".join([
-                f"Source: {r['source']}\nContent: {r['content']}" 
-                for r in results
-            ])
+            results, query_vector = assistant.search(prompt, k=8, mode="hybrid", return_embedding=True)
             
-            # Generate response
-            response = assistant.generate_response(prompt, context)
+            # Pack a token-budgeted, de-duplicated context
+            context, results, context_stats = assistant.assemble_context(prompt, results, query_vector=query_vector)
             
-        # Stream the response
-        for chunk in response.split():
-            full_response += chunk + " "
-            time.sleep(0.05)
+        # Stream the response as tokens arrive
+        start_time = time.perf_counter()
+        first_token_time = None
+        for chunk in assistant.stream_response(prompt, context):
+            if first_token_time is None:
+                first_token_time = time.perf_counter() - start_time
+            full_response += chunk
             message_placeholder.markdown(full_response + "▌")
         message_placeholder.markdown(full_response)
+        total_time = time.perf_counter() - start_time
+        if first_token_time is None:
+            first_token_time = total_time
+        metrics = (
+            f"⏱️ First token {first_token_time:.2f}s · Total {total_time:.2f}s · "
+            f"Context {context_stats['tokens_after']} tokens ({context_stats['tokens_saved']} saved)"
+        )
+        st.caption(metrics)
         
         # Show sources
         with st.expander("Policy References"):
@@ -137,5 +173,6 @@ if prompt := st.chat_input("Ask about HR policies..."):
     st.session_state.messages.append({
         "role": "assistant", 
         "content": full_response,
+        "metrics": metrics,
         "sources": results
     })
\ No newline at end of file
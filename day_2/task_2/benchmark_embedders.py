@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Compare embedding backends for the HR Policy Assistant
+
+Reports start-up time, embedding throughput and agreement with the PyTorch
+vectors (mean cosine similarity) for each backend.
+
+Usage:
+    python benchmark_embedders.py --export onnx_model     # one-off ONNX + int8 export
+    python benchmark_embedders.py --onnx onnx_model/model.int8.onnx data/policy.pdf
+"""
+import argparse
+import time
+import numpy as np
+from utils.embedders import export_onnx, load_embedder
+from utils.loader import iter_pages
+from utils.processor import chunk_pages
+
+def sample_texts(paths, limit):
+    """Section texts from the given documents"""
+    texts = []
+    for path in paths:
+        pages = dict(iter_pages(path))
+        for chunk in chunk_pages(pages.items()):
+            texts.append(pages[chunk.page][chunk.start:chunk.end])
+            if len(texts) >= limit:
+                return texts
+    return texts
+
+def benchmark(backend, texts, onnx_model_path=None, batch_size=32):
+    """Time loading an embedder and encoding the texts"""
+    started = time.perf_counter()
+    embedder = load_embedder(backend, onnx_model_path)
+    embedder.encode(texts[:1])
+    startup = time.perf_counter() - started
+
+    started = time.perf_counter()
+    embeddings = embedder.encode(texts, batch_size=batch_size)
+    elapsed = time.perf_counter() - started
+    return {"startup_s": startup, "texts_per_second": len(texts) / elapsed}, np.asarray(embeddings)
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare embedding backends")
+    parser.add_argument("documents", nargs="*", help="Policy documents to sample sections from")
+    parser.add_argument("--onnx", help="ONNX model to compare against the PyTorch backend")
+    parser.add_argument("--export", metavar="DIR", help="Export ONNX and int8 models to DIR and exit")
+    parser.add_argument("--limit", type=int, default=1000, help="Maximum number of sections to embed")
+    parser.add_argument("--batch-size", type=int, default=32)
+    args = parser.parse_args()
+
+    if args.export:
+        print(f"Exported: {export_onnx(args.export)}")
+        return
+    if not args.documents:
+        parser.error("documents are required unless --export is given")
+
+    texts = sample_texts(args.documents, args.limit)
+    print(f"Embedding {len(texts)} sections")
+
+    reference_stats, reference = benchmark("torch", texts, batch_size=args.batch_size)
+    print(f"{'torch':>6}: start-up {reference_stats['startup_s']:.2f}s, "
+          f"{reference_stats['texts_per_second']:.1f} sections/s")
+
+    if args.onnx:
+        stats, embeddings = benchmark("onnx", texts, args.onnx, batch_size=args.batch_size)
+        # Both pipelines L2-normalize, so the row-wise dot product is the cosine
+        agreement = float(np.mean(np.sum(reference * embeddings, axis=1)))
+        print(f"{'onnx':>6}: start-up {stats['startup_s']:.2f}s, "
+              f"{stats['texts_per_second']:.1f} sections/s, cosine vs torch {agreement:.4f}")
+
+if __name__ == "__main__":
+    main()
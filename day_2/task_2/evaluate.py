@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Offline retrieval evaluation for the HR Policy Assistant
+
+Each line of the questions file is a JSON object such as:
+    {"question": "How many days of casual leave do I get?",
+     "relevant": [{"document": "Leave-Policy.pdf", "page": 3}]}
+"page" is optional; without it any section of the document counts as relevant.
+
+Usage:
+    python evaluate.py --questions questions.jsonl --k 5 data/*.pdf
+"""
+import argparse
+import json
+import time
+from utils.rag import PolicyAssistant
+
+def load_questions(path):
+    """Read labelled questions from a JSONL file"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+def _matches(result, label):
+    if result["document"] != label["document"]:
+        return False
+    return label.get("page") is None or result["page"] == label["page"]
+
+def score(results, relevant):
+    """Return (recall, reciprocal rank) of one ranked result list"""
+    found = sum(any(_matches(r, label) for r in results) for label in relevant)
+    recall = found / len(relevant) if relevant else 0.0
+    for rank, result in enumerate(results, start=1):
+        if any(_matches(result, label) for label in relevant):
+            return recall, 1 / rank
+    return recall, 0.0
+
+def evaluate(assistant, questions, k=5, mode="dense", batch_size=256):
+    """Run labelled questions through search_batch and aggregate recall@k, MRR and throughput"""
+    total_recall = total_rr = search_time = 0.0
+    for start in range(0, len(questions), batch_size):
+        batch = questions[start:start + batch_size]
+        started = time.perf_counter()
+        batch_results = assistant.search_batch([q["question"] for q in batch], k=k, mode=mode)
+        search_time += time.perf_counter() - started
+
+        for question, results in zip(batch, batch_results):
+            recall, rr = score(results, question["relevant"])
+            total_recall += recall
+            total_rr += rr
+
+    n = len(questions)
+    if not n:
+        return {"questions": 0, f"recall@{k}": 0.0, "mrr": 0.0, "queries_per_second": 0.0}
+    return {
+        "questions": n,
+        f"recall@{k}": total_recall / n,
+        "mrr": total_rr / n,
+        "queries_per_second": n / search_time if search_time else float("inf")
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Evaluate policy retrieval on labelled questions")
+    parser.add_argument("documents", nargs="+", help="Policy documents to index (PDF/DOCX)")
+    parser.add_argument("--questions", required=True, help="JSONL file of labelled questions")
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--mode", choices=["dense", "hybrid"], default="dense")
+    parser.add_argument("--batch-size", type=int, default=256)
+    args = parser.parse_args()
+
+    questions = load_questions(args.questions)
+    if not questions:
+        parser.exit(1, f"No questions found in {args.questions}\n")
+
+    assistant = PolicyAssistant()
+    for path in args.documents:
+        assistant.add_document(path)
+
+    report = evaluate(assistant, questions, k=args.k, mode=args.mode, batch_size=args.batch_size)
+    for name, value in report.items():
+        print(f"{name:>20}: {value:.4f}" if isinstance(value, float) else f"{name:>20}: {value}")
+
+if __name__ == "__main__":
+    main()
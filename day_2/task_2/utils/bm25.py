@@ -0,0 +1,69 @@
+from collections import Counter, defaultdict
+import heapq
+import math
+import re
+
+_TERM_PATTERN = re.compile(r"\w+")
+
+def tokenize(text):
+    """Lower-cased word terms, keeping numbers such as section ids"""
+    return _TERM_PATTERN.findall(text.lower())
+
+def term_frequencies(text):
+    """Term -> count mapping for a section"""
+    return dict(Counter(tokenize(text)))
+
+class BM25Index:
+    """In-process inverted index scored with Okapi BM25"""
+
+    def __init__(self, k1=1.5, b=0.75):
+        self.k1 = k1
+        self.b = b
+        self.postings = defaultdict(dict)
+        self.lengths = {}
+        self.total_length = 0
+        self._terms = {}
+
+    def add(self, section_id, frequencies):
+        """Index a section from its precomputed term frequencies"""
+        for term, count in frequencies.items():
+            self.postings[term][section_id] = count
+        length = sum(frequencies.values())
+        self.lengths[section_id] = length
+        self.total_length += length
+        self._terms[section_id] = list(frequencies)
+
+    def remove(self, section_id):
+        """Drop a section from the index"""
+        for term in self._terms.pop(section_id):
+            postings = self.postings[term]
+            del postings[section_id]
+            if not postings:
+                del self.postings[term]
+        self.total_length -= self.lengths.pop(section_id)
+
+    def search(self, query, k=10):
+        """Return up to k (section_id, score) pairs, best first"""
+        if not self.lengths:
+            return []
+        n_sections = len(self.lengths)
+        average_length = self.total_length / n_sections
+
+        scores = defaultdict(float)
+        for term in set(tokenize(query)):
+            postings = self.postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (n_sections - len(postings) + 0.5) / (len(postings) + 0.5))
+            for section_id, count in postings.items():
+                norm = self.k1 * (1 - self.b + self.b * self.lengths[section_id] / average_length)
+                scores[section_id] += idf * count * (self.k1 + 1) / (count + norm)
+        return heapq.nlargest(k, scores.items(), key=lambda item: item[1])
+
+def reciprocal_rank_fusion(rankings, k=60):
+    """Fuse ranked id lists into (id, score) pairs, best first"""
+    scores = defaultdict(float)
+    for ranking in rankings:
+        for rank, section_id in enumerate(ranking):
+            scores[section_id] += 1 / (k + rank + 1)
+    return sorted(scores.items(), key=lambda item: item[1], reverse=True)
@@ -0,0 +1,102 @@
+import hashlib
+import numpy as np
+import os
+
+MODEL_NAME = 'all-MiniLM-L6-v2'
+HF_MODEL_ID = f"sentence-transformers/{MODEL_NAME}"
+BACKENDS = ("torch", "onnx")
+
+class SentenceTransformerEmbedder:
+    """The reference PyTorch SentenceTransformer pipeline"""
+
+    def __init__(self, model_name=MODEL_NAME):
+        from sentence_transformers import SentenceTransformer
+        self.model = SentenceTransformer(model_name)
+        self.tokenizer = self.model.tokenizer
+        self.max_seq_length = self.model.max_seq_length
+
+    def encode(self, texts, batch_size=32):
+        return self.model.encode(texts, batch_size=batch_size)
+
+class OnnxEmbedder:
+    """all-MiniLM-L6-v2 on ONNX Runtime with the same mean pooling and normalization"""
+
+    def __init__(self, model_path, tokenizer_name=HF_MODEL_ID, max_seq_length=256):
+        import onnxruntime as ort
+        from transformers import AutoTokenizer
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = ort.InferenceSession(model_path, options, providers=["CPUExecutionProvider"])
+        self.input_names = {i.name for i in self.session.get_inputs()}
+        self.tokenizer = AutoTokenizer.from_pretrained(tokenizer_name)
+        self.max_seq_length = max_seq_length
+
+    def encode(self, texts, batch_size=32):
+        if isinstance(texts, str):
+            texts = [texts]
+        batches = []
+        for start in range(0, len(texts), batch_size):
+            encoded = self.tokenizer(
+                texts[start:start + batch_size], padding=True, truncation=True,
+                max_length=self.max_seq_length, return_tensors="np"
+            )
+            inputs = {name: encoded[name].astype('int64') for name in self.input_names}
+            token_embeddings = self.session.run(None, inputs)[0]
+
+            # Mean over real tokens, then L2-normalize, matching the SentenceTransformer modules
+            mask = encoded["attention_mask"][..., None].astype('float32')
+            pooled = (token_embeddings * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+            batches.append(pooled / np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None))
+        if not batches:
+            return np.zeros((0, self.session.get_outputs()[0].shape[-1]), dtype='float32')
+        return np.vstack(batches).astype('float32')
+
+def export_onnx(output_dir, model_id=HF_MODEL_ID, quantize=True):
+    """Export the transformer to ONNX (optionally int8-quantized) and return the model path"""
+    import torch
+    from transformers import AutoModel, AutoTokenizer
+
+    os.makedirs(output_dir, exist_ok=True)
+    model = AutoModel.from_pretrained(model_id).eval()
+    tokenizer = AutoTokenizer.from_pretrained(model_id)
+    sample = tokenizer(["export sample"], return_tensors="pt")
+
+    model_path = os.path.join(output_dir, "model.onnx")
+    input_names = ["input_ids", "attention_mask", "token_type_ids"]
+    torch.onnx.export(
+        model,
+        tuple(sample[name] for name in input_names),
+        model_path,
+        input_names=input_names,
+        output_names=["last_hidden_state"],
+        dynamic_axes={name: {0: "batch", 1: "sequence"} for name in input_names + ["last_hidden_state"]},
+        opset_version=14
+    )
+    if not quantize:
+        return model_path
+
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+    quantized_path = os.path.join(output_dir, "model.int8.onnx")
+    quantize_dynamic(model_path, quantized_path, weight_type=QuantType.QInt8)
+    return quantized_path
+
+def load_embedder(backend="torch", onnx_model_path=None):
+    """Create an embedder for the given backend"""
+    if backend == "torch":
+        return SentenceTransformerEmbedder()
+    elif backend == "onnx":
+        if not onnx_model_path:
+            raise ValueError("The onnx backend needs ONNX_MODEL_PATH (see export_onnx)")
+        return OnnxEmbedder(onnx_model_path)
+    else:
+        raise ValueError(f"Unknown embedding backend: {backend}. Expected one of {BACKENDS}")
+
+def embedder_fingerprint(backend="torch", onnx_model_path=None):
+    """Short id of the model behind a backend, so vectors from different models are never mixed"""
+    if backend == "onnx" and onnx_model_path and os.path.exists(onnx_model_path):
+        stat = os.stat(onnx_model_path)
+        source = f"onnx:{os.path.abspath(onnx_model_path)}:{stat.st_size}:{int(stat.st_mtime)}"
+    else:
+        source = f"{backend}:{onnx_model_path or MODEL_NAME}"
+    return hashlib.sha256(source.encode("utf-8")).hexdigest()[:12]
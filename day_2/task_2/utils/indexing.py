@@ -0,0 +1,122 @@
+import faiss
+import numpy as np
+import time
+
+INDEX_TYPES = ("flat", "ivf_flat", "hnsw", "ivf_pq")
+
+# Corpus sizes (in vectors) at which the automatic choice moves to the next index type
+AUTO_THRESHOLDS = (
+    (50_000, "flat"),
+    (500_000, "hnsw"),
+    (2_000_000, "ivf_flat"),
+)
+
+TRAINING_SAMPLE_SIZE = 100_000
+HNSW_M = 32
+PQ_BITS = 8
+# PQ codebooks need at least one training vector per centroid
+PQ_MIN_VECTORS = 2 ** PQ_BITS
+
+def choose_index_type(n_vectors):
+    """Pick an index type for a corpus of n_vectors"""
+    for limit, index_type in AUTO_THRESHOLDS:
+        if n_vectors < limit:
+            return index_type
+    return "ivf_pq"
+
+def fit_index_type(index_type, n_vectors):
+    """The requested index type, or IVF-Flat when the corpus is too small to train IVF-PQ"""
+    if index_type == "ivf_pq" and n_vectors < PQ_MIN_VECTORS:
+        return "ivf_flat"
+    return index_type
+
+def _nlist(n_vectors):
+    # ~4 * sqrt(n) lists, keeping at least 39 training points per centroid
+    return int(max(1, min(4 * np.sqrt(n_vectors), n_vectors // 39)))
+
+def _pq_subquantizers(dim):
+    # 8-bit codes over sub-vectors of ~8 dimensions
+    for m in range(max(1, dim // 8), 0, -1):
+        if dim % m == 0:
+            return m
+
+def build_index(dim, index_type, n_vectors):
+    """Create an empty index that accepts add_with_ids"""
+    if index_type == "flat":
+        return faiss.IndexIDMap2(faiss.IndexFlatL2(dim))
+    elif index_type == "hnsw":
+        index = faiss.IndexHNSWFlat(dim, HNSW_M)
+        index.hnsw.efConstruction = 80
+        return faiss.IndexIDMap2(index)
+    elif index_type == "ivf_flat":
+        return faiss.IndexIVFFlat(faiss.IndexFlatL2(dim), dim, _nlist(n_vectors))
+    elif index_type == "ivf_pq":
+        return faiss.IndexIVFPQ(faiss.IndexFlatL2(dim), dim, _nlist(n_vectors), _pq_subquantizers(dim), PQ_BITS)
+    else:
+        raise ValueError(f"Unknown index type: {index_type}. Expected one of {INDEX_TYPES}")
+
+def train_index(index, embeddings, sample_size=TRAINING_SAMPLE_SIZE, seed=0):
+    """Train an index on a random sample of the embeddings if it needs training"""
+    if index.is_trained:
+        return
+    if len(embeddings) > sample_size:
+        rows = np.sort(np.random.default_rng(seed).choice(len(embeddings), sample_size, replace=False))
+        embeddings = embeddings[rows]
+    index.train(np.ascontiguousarray(embeddings, dtype='float32'))
+
+def set_search_params(index, nprobe=None, ef_search=None):
+    """Apply nprobe (IVF) or efSearch (HNSW) to an index, looking through ID maps"""
+    inner = faiss.downcast_index(index)
+    if hasattr(inner, "id_map"):
+        inner = faiss.downcast_index(inner.index)
+    if nprobe is not None and hasattr(inner, "nprobe"):
+        inner.nprobe = nprobe
+    if ef_search is not None and hasattr(inner, "hnsw"):
+        inner.hnsw.efSearch = ef_search
+
+def recall_latency_report(embeddings, queries, k=10, index_types=INDEX_TYPES,
+                          nprobes=(1, 4, 16, 64), ef_searches=(16, 32, 64, 128)):
+    """Measure recall@k against exact search and mean latency for each index setting"""
+    embeddings = np.ascontiguousarray(embeddings, dtype='float32')
+    queries = np.ascontiguousarray(queries, dtype='float32')
+    ids = np.arange(len(embeddings), dtype='int64')
+    dim = embeddings.shape[1]
+
+    exact = faiss.IndexFlatL2(dim)
+    exact.add(embeddings)
+    _, truth = exact.search(queries, k)
+
+    report = []
+    for index_type in index_types:
+        if fit_index_type(index_type, len(embeddings)) != index_type:
+            report.append({
+                "index_type": index_type,
+                "skipped": f"needs at least {PQ_MIN_VECTORS} vectors to train, corpus has {len(embeddings)}"
+            })
+            continue
+        index = build_index(dim, index_type, len(embeddings))
+        train_index(index, embeddings)
+        index.add_with_ids(embeddings, ids)
+
+        if index_type.startswith("ivf"):
+            settings = [{"nprobe": nprobe} for nprobe in nprobes]
+        elif index_type == "hnsw":
+            settings = [{"ef_search": ef} for ef in ef_searches]
+        else:
+            settings = [{}]
+
+        for params in settings:
+            set_search_params(index, **params)
+            start = time.perf_counter()
+            # One query at a time, as the chat path issues them
+            found = np.vstack([index.search(queries[i:i + 1], k)[1] for i in range(len(queries))])
+            elapsed = time.perf_counter() - start
+
+            hits = sum(len(set(row) & set(expected)) for row, expected in zip(found, truth))
+            report.append({
+                "index_type": index_type,
+                **params,
+                "recall": hits / truth.size,
+                "latency_ms": 1000 * elapsed / len(queries)
+            })
+    return report
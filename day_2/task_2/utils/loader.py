@@ -1,20 +1,68 @@
 import PyPDF2
 from docx import Document
+from concurrent.futures import ProcessPoolExecutor
+from collections import deque
 import os
 
-def load_document(file_path):
-    """Load PDF or DOCX file content"""
+# PDFs with at least this many pages are extracted in a process pool
+PARALLEL_PAGE_THRESHOLD = 64
+PAGES_PER_TASK = 16
+
+def _extract_pages(file_path, start, stop):
+    """Extract the text of pages [start, stop) in a worker process"""
+    with open(file_path, 'rb') as f:
+        reader = PyPDF2.PdfReader(f)
+        return [reader.pages[i].extract_text() or "" for i in range(start, stop)]
+
+def _iter_pdf_pages(file_path, workers=None):
+    with open(file_path, 'rb') as f:
+        reader = PyPDF2.PdfReader(f)
+        page_count = len(reader.pages)
+        if page_count < PARALLEL_PAGE_THRESHOLD or workers == 1:
+            for i, page in enumerate(reader.pages):
+                yield i + 1, page.extract_text() or ""
+            return
+
+    workers = workers or os.cpu_count() or 1
+    ranges = [(start, min(start + PAGES_PER_TASK, page_count))
+              for start in range(0, page_count, PAGES_PER_TASK)]
+
+    # Keep a bounded window of batches in flight so memory stays flat
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for start, stop in ranges:
+            pending.append((start, executor.submit(_extract_pages, file_path, start, stop)))
+            if len(pending) >= workers * 2:
+                yield from _drain(pending.popleft())
+        while pending:
+            yield from _drain(pending.popleft())
+
+def _drain(batch):
+    start, future = batch
+    for offset, text in enumerate(future.result()):
+        yield start + offset + 1, text
+
+def _iter_docx_pages(file_path):
+    # DOCX has no fixed layout; explicit page breaks delimit pages
+    doc = Document(file_path)
+    page_number, lines = 1, []
+    for para in doc.paragraphs:
+        lines.append(para.text)
+        if para._p.xpath('.//w:br[@w:type="page"]'):
+            yield page_number, "\n".join(lines)
+            page_number, lines = page_number + 1, []
+    if lines:
+        yield page_number, "\n".join(lines)
+
+def iter_pages(file_path, workers=None):
+    """Yield (page_number, text) for each page of a PDF or DOCX file"""
     if file_path.endswith('.pdf'):
-        with open(file_path, 'rb') as f:
-            reader = PyPDF2.PdfReader(f)
-            text = ""
-            for page in reader.pages:
-                text += page.extract_text() + "\n"
-            return text
-            
+        return _iter_pdf_pages(file_path, workers)
     elif file_path.endswith('.docx'):
-        doc = Document(file_path)
-        return "\n".join([para.text for para in doc.paragraphs])
-    
+        return _iter_docx_pages(file_path)
     else:
-        raise ValueError("Unsupported file format")
\ No newline at end of file
+        raise ValueError("Unsupported file format")
+
+def load_document(file_path):
+    """Load PDF or DOCX file content"""
+    return "\n".join(text for _, text in iter_pages(file_path))
@@ -1,28 +1,50 @@
-def chunk_policy(text, max_chars=500):
-    """Split policy text into meaningful sections"""
-    sections = []
-    current_section = ""
-    
-    # Split by major headings
-    for line in text.split('\n'):
-        line = line.strip()
-        if not line:
-            continue
-            
-        # Detect section headers
-        if line.startswith(('## ', '# ', '**', '•', '➢')) or line.isupper():
-            if current_section:
-                sections.append(current_section)
-                current_section = ""
-                
-        current_section += line + " "
-        
-        # Split long sections
-        if len(current_section) > max_chars:
-            sections.append(current_section)
-            current_section = ""
-    
-    if current_section:
-        sections.append(current_section)
-        
-    return sections
\ No newline at end of file
+from collections import namedtuple
+import re
+
+# A chunk is a [start, end) character span into the text of one page
+Chunk = namedtuple("Chunk", ["page", "start", "end"])
+
+# all-MiniLM-L6-v2 reads 256 tokens including [CLS] and [SEP]
+MAX_TOKENS = 254
+OVERLAP_TOKENS = 32
+
+_WORD_PATTERN = re.compile(r"\w+|[^\w\s]")
+
+def word_offsets(text):
+    """Approximate tokenizer returning (start, end) offsets of words and punctuation"""
+    return [match.span() for match in _WORD_PATTERN.finditer(text)]
+
+def _starts_line(text, offsets, i):
+    # True when token i is the first token on its line
+    previous_end = offsets[i - 1][1] if i else 0
+    return "\n" in text[previous_end:offsets[i][0]]
+
+def chunk_policy(text, max_tokens=MAX_TOKENS, overlap=OVERLAP_TOKENS, tokenize=word_offsets):
+    """Split policy text into (start, end) spans of at most max_tokens tokens"""
+    if overlap >= max_tokens:
+        raise ValueError("overlap must be smaller than max_tokens")
+
+    offsets = [span for span in tokenize(text) if span[1] > span[0]]
+    spans = []
+    start = 0
+    while start < len(offsets):
+        stop = min(start + max_tokens, len(offsets))
+
+        # Prefer ending just before a new line (headings, bullets) in the back half
+        if stop < len(offsets):
+            for i in range(stop, start + max_tokens // 2, -1):
+                if _starts_line(text, offsets, i):
+                    stop = i
+                    break
+
+        spans.append((offsets[start][0], offsets[stop - 1][1]))
+        if stop == len(offsets):
+            break
+        start = max(stop - overlap, start + 1)
+    return spans
+
+def chunk_pages(pages, max_tokens=MAX_TOKENS, overlap=OVERLAP_TOKENS, tokenize=word_offsets):
+    """Yield a Chunk for every span of an iterable of (page_number, text)"""
+    for page_number, text in pages:
+        for start, end in chunk_policy(text, max_tokens, overlap, tokenize):
+            yield Chunk(page_number, start, end)
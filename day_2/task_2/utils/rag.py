@@ -1,75 +1,548 @@
 import google.generativeai as genai
-from sentence_transformers import SentenceTransformer
 import faiss
 import numpy as np
+import hashlib
+import json
 import os
+import re
+import shutil
+import tempfile
 from dotenv import load_dotenv
+from .embedders import embedder_fingerprint, load_embedder
+from .bm25 import BM25Index, reciprocal_rank_fusion, term_frequencies, tokenize
+from .indexing import (
+    HNSW_M, INDEX_TYPES, build_index, choose_index_type, fit_index_type, recall_latency_report, set_search_params,
+    train_index
+)
 
 load_dotenv()
 
+EMBED_BATCH_SIZE = 256
+
+_SENTENCE_PATTERN = re.compile(r"(?<=[.!?;:])\s+|\n+")
+
+def _format_section(source, content):
+    return f"Source: {source}\nContent: {content}"
+
+def _normalize(vectors):
+    return vectors / np.clip(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12, None)
+
+def hash_document(file_path, block_size=1 << 20):
+    """Return the SHA-256 of a document's bytes"""
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
 class PolicyAssistant:
-    def __init__(self):
-        # Initialize models
-        self.embedding_model = SentenceTransformer('all-MiniLM-L6-v2')
-        genai.configure(api_key=os.getenv("GOOGLE_API_KEY"))
-        self.llm = genai.GenerativeModel("gemini-1.5-flash")
-        
-        # Initialize vector store
+    def __init__(self, cache_dir=".index_cache", index_type="auto", nprobe=16, ef_search=64,
+                 embedding_backend=None, onnx_model_path=None, embedding_model=None, embedding_provider=None):
+        # Models are loaded on first use to keep app start-up fast; an already
+        # loaded embedder, or a callable returning a shared one, can be passed in
+        self.embedding_backend = embedding_backend or os.getenv("EMBEDDING_BACKEND", "torch")
+        self.onnx_model_path = onnx_model_path or os.getenv("ONNX_MODEL_PATH")
+        self._embedding_model = embedding_model
+        self._embedding_provider = embedding_provider
+        self._llm = None
+        # Cached vectors are only reused by the backend and model that produced them
+        self.embedding_fingerprint = embedder_fingerprint(self.embedding_backend, self.onnx_model_path)
+
+        # Initialize vector store; ids in the FAISS index key the tables below
         self.index = None
-        self.sections = []
-        self.metadata = []
-        
+        self.metadata = {}
+        self.documents = {}
+        self._next_id = 0
+
+        # Lexical index for hybrid search, fed from per-section term counts
+        self.bm25 = BM25Index()
+
+        # "auto" picks flat/HNSW/IVF/IVF-PQ from the corpus size
+        self.index_type = index_type
+        self.active_index_type = None
+        self.nprobe = nprobe
+        self.ef_search = ef_search
+
+        # Embeddings are persisted under the hash of the source document and the embedding model
+        self.cache_dir = cache_dir
+        # Names of saved documents whose cache entries were gone at restore time
+        self.missing_documents = []
+
+    @property
+    def embedding_model(self):
+        if self._embedding_model is None:
+            if self._embedding_provider is not None:
+                self._embedding_model = self._embedding_provider()
+            else:
+                self._embedding_model = load_embedder(self.embedding_backend, self.onnx_model_path)
+        return self._embedding_model
+
+    @property
+    def llm(self):
+        if self._llm is None:
+            genai.configure(api_key=os.getenv("GOOGLE_API_KEY"))
+            self._llm = genai.GenerativeModel("gemini-1.5-flash")
+        return self._llm
+
     def load_policy(self, file_path):
         """Load and index policy document"""
-        from .loader import load_document
-        from .processor import chunk_policy
-        
-        # Load and chunk document
-        text = load_document(file_path)
-        self.sections = chunk_policy(text)
-        
-        # Generate embeddings
-        embeddings = self.embedding_model.encode(self.sections)
-        
-        # Create FAISS index
-        self.index = faiss.IndexFlatL2(embeddings.shape[1])
-        self.index.add(embeddings.astype('float32'))
-        
-        # Store metadata
-        policy_name = os.path.basename(file_path)
-        self.metadata = [{
-            "policy": policy_name, 
-            "section": f"Section {i+1}"
-        } for i in range(len(self.sections))]
-    
-    def search(self, query, k=3):
-        """Find relevant policy sections"""
-        if self.index is None or not self.sections:
+        return self.add_document(file_path)
+
+    def add_document(self, file_path, name=None):
+        """Add a document to the corpus, embedding it only if it is new or changed"""
+        doc_id = hash_document(file_path)
+        name = name or os.path.basename(file_path)
+        if doc_id in self.documents:
+            self.documents[doc_id]["name"] = name
+            return doc_id
+
+        # A new version of an existing policy replaces the old one
+        for old_id, doc in list(self.documents.items()):
+            if doc["name"] == name:
+                self.remove_document(old_id)
+
+        pages, chunks, embeddings, terms = self._load_embeddings(doc_id, file_path)
+        ids = self._register_document(doc_id, name, self._next_id, pages, chunks, embeddings, terms)
+        if name in self.missing_documents:
+            self.missing_documents.remove(name)
+
+        # Grow the index in place unless the corpus outgrew the current index type
+        index_type = self._target_index_type()
+        if self.index is None or index_type != self.active_index_type:
+            self._rebuild_index(index_type)
+        else:
+            self.index.add_with_ids(np.ascontiguousarray(embeddings, dtype='float32'), ids)
+        return doc_id
+
+    def _register_document(self, doc_id, name, first_id, pages, chunks, embeddings, terms):
+        """Add a document's sections to the metadata table and BM25 index, returning their ids"""
+        ids = np.arange(first_id, first_id + len(chunks), dtype='int64')
+        self._next_id = max(self._next_id, first_id + len(chunks))
+
+        # Sections are spans into the stored page text rather than copies
+        for i, (section_id, chunk, frequencies) in enumerate(zip(ids.tolist(), chunks, terms)):
+            self.bm25.add(section_id, frequencies)
+            self.metadata[section_id] = {
+                "document": doc_id,
+                "section": i + 1,
+                "page": chunk.page,
+                "start": chunk.start,
+                "end": chunk.end
+            }
+        self.documents[doc_id] = {"name": name, "ids": ids.tolist(), "pages": pages, "embeddings": embeddings}
+        return ids
+
+    def remove_document(self, document):
+        """Remove a document from the corpus by id or file name"""
+        doc_id = self._resolve_document(document)
+        doc = self.documents.pop(doc_id)
+        for section_id in doc["ids"]:
+            del self.metadata[section_id]
+            self.bm25.remove(section_id)
+        try:
+            self.index.remove_ids(np.array(doc["ids"], dtype='int64'))
+        except RuntimeError:
+            # HNSW graphs do not support deletion; rebuild from cached embeddings
+            self._rebuild_index(self.active_index_type)
+
+    def _target_index_type(self):
+        if self.index_type == "auto":
+            return choose_index_type(len(self.metadata))
+        # An explicit IVF-PQ choice takes effect once the corpus can train it
+        return fit_index_type(self.index_type, len(self.metadata))
+
+    def _rebuild_index(self, index_type):
+        """Build a fresh index of the given type over every document's cached embeddings"""
+        docs = list(self.documents.values())
+        if not docs:
+            self.index, self.active_index_type = None, None
+            return
+
+        dim = docs[0]["embeddings"].shape[1]
+        index = build_index(dim, index_type, len(self.metadata))
+        if not index.is_trained:
+            train_index(index, np.vstack([doc["embeddings"] for doc in docs]))
+        for doc in docs:
+            index.add_with_ids(
+                np.ascontiguousarray(doc["embeddings"], dtype='float32'),
+                np.array(doc["ids"], dtype='int64')
+            )
+        set_search_params(index, nprobe=self.nprobe, ef_search=self.ef_search)
+        self.index, self.active_index_type = index, index_type
+
+    def set_search_params(self, nprobe=None, ef_search=None):
+        """Tune the recall/latency trade-off of the current index"""
+        self.nprobe = nprobe or self.nprobe
+        self.ef_search = ef_search or self.ef_search
+        if self.index is not None:
+            set_search_params(self.index, nprobe=self.nprobe, ef_search=self.ef_search)
+
+    def index_report(self, n_queries=200, k=10, index_types=INDEX_TYPES):
+        """Recall-vs-latency report for each index type, using sampled sections as queries
+
+        Index types the corpus is too small to train are reported with a "skipped" reason.
+        """
+        if not self.documents:
             raise ValueError("No policy loaded. Please upload and load a policy document first.")
-        query_embedding = self.embedding_model.encode([query])
-        distances, indices = self.index.search(query_embedding.astype('float32'), k)
-        
-        results = []
-        for i, idx in enumerate(indices[0]):
-            results.append({
-                "content": self.sections[idx],
-                "source": f"{self.metadata[idx]['policy']} - {self.metadata[idx]['section']}",
-                "distance": float(distances[0][i])
-            })
-        return results
-    
-    def generate_response(self, query, context):
-        """Generate policy-compliant answer"""
-        prompt = f"""
-        You are an HR policy expert. Answer the user's question using ONLY the 
+        embeddings = np.vstack([doc["embeddings"] for doc in self.documents.values()])
+        rows = np.random.default_rng(0).choice(len(embeddings), min(n_queries, len(embeddings)), replace=False)
+        return recall_latency_report(embeddings, embeddings[np.sort(rows)], k=min(k, len(embeddings)),
+                                     index_types=index_types)
+
+    def list_documents(self):
+        """List documents in the corpus"""
+        return [
+            {"id": doc_id, "name": doc["name"], "sections": len(doc["ids"])}
+            for doc_id, doc in self.documents.items()
+        ]
+
+    def save(self, path):
+        """Persist the corpus manifest and FAISS index to a directory"""
+        os.makedirs(path, exist_ok=True)
+        manifest = {
+            "next_id": self._next_id,
+            "index_type": self.active_index_type,
+            "embedding_fingerprint": self.embedding_fingerprint,
+            "documents": [
+                {"id": doc_id, "name": doc["name"], "first_id": doc["ids"][0] if doc["ids"] else self._next_id}
+                for doc_id, doc in self.documents.items()
+            ]
+        }
+        index_path = os.path.join(path, "index.faiss")
+        if self.index is not None:
+            faiss.write_index(self.index, index_path + ".tmp")
+            os.replace(index_path + ".tmp", index_path)
+        elif os.path.exists(index_path):
+            os.remove(index_path)
+        self._write_json(os.path.join(path, "manifest.json"), manifest)
+
+    def restore(self, path):
+        """Load a corpus saved with save(), reading document data from the embedding cache
+
+        Documents whose cache entry is missing (pruned cache, other embedding
+        model) are skipped and listed in missing_documents for re-upload.
+        """
+        manifest_path = os.path.join(path, "manifest.json")
+        if not os.path.exists(manifest_path):
+            return
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+
+        for doc in manifest["documents"]:
+            cached = self._load_cache(self._cache_path(doc["id"]))
+            if cached is None:
+                self.missing_documents.append(doc["name"])
+                continue
+            self._register_document(doc["id"], doc["name"], doc["first_id"], *cached)
+        self._next_id = max(self._next_id, manifest["next_id"])
+
+        index_path = os.path.join(path, "index.faiss")
+        # An index built by another embedding model, or holding skipped documents, is rebuilt
+        same_model = manifest.get("embedding_fingerprint") == self.embedding_fingerprint
+        if (manifest["index_type"] and same_model and not self.missing_documents
+                and os.path.exists(index_path)):
+            self.index = faiss.read_index(index_path)
+            self.active_index_type = manifest["index_type"]
+            set_search_params(self.index, nprobe=self.nprobe, ef_search=self.ef_search)
+        elif self.documents:
+            self._rebuild_index(self._target_index_type())
+
+    def memory_usage(self):
+        """Estimated resident bytes of the index, in-memory embeddings, page text and lookup tables"""
+        n_sections = len(self.metadata)
+        if self.index is None:
+            index_bytes = 0
+        elif self.active_index_type == "ivf_pq":
+            index_bytes = n_sections * (faiss.extract_index_ivf(self.index).code_size + 8)
+        else:
+            index_bytes = n_sections * (4 * self.index.d + 8)
+            if self.active_index_type == "hnsw":
+                index_bytes += n_sections * 2 * HNSW_M * 4
+        # Snapshot so the tenant manager can measure while a document is being added
+        docs = list(self.documents.values())
+        # Memory-mapped cache arrays are paged in from disk on demand and not counted
+        embedding_bytes = sum(doc["embeddings"].nbytes for doc in docs
+                              if not isinstance(doc["embeddings"], np.memmap))
+        text_bytes = sum(len(text) for doc in docs for text in doc["pages"].values())
+        # Metadata dicts and BM25 postings cost a few hundred bytes per section
+        return index_bytes + embedding_bytes + text_bytes + n_sections * 600
+
+    def _resolve_document(self, document):
+        if document in self.documents:
+            return document
+        for doc_id, doc in self.documents.items():
+            if doc["name"] == document:
+                return doc_id
+        raise KeyError(f"Unknown document: {document}")
+
+    def _load_embeddings(self, doc_id, file_path):
+        """Return page text, chunk spans, embeddings and term counts for a document, from cache or freshly computed"""
+        from .loader import iter_pages
+        from .processor import chunk_pages
+
+        cache_path = self._cache_path(doc_id)
+        cached = self._load_cache(cache_path)
+        if cached is not None:
+            return cached
+
+        pages = {}
+
+        def record_pages():
+            for page_number, text in iter_pages(file_path):
+                pages[page_number] = text
+                yield page_number, text
+
+        # Stream pages through the chunker and embed in batches
+        max_tokens = self.embedding_model.max_seq_length - 2
+        chunks, terms, batches, batch = [], [], [], []
+        for chunk in chunk_pages(record_pages(), max_tokens=max_tokens, tokenize=self._token_offsets):
+            text = pages[chunk.page][chunk.start:chunk.end]
+            chunks.append(chunk)
+            terms.append(term_frequencies(text))
+            batch.append(text)
+            if len(batch) == EMBED_BATCH_SIZE:
+                batches.append(self.embedding_model.encode(batch))
+                batch = []
+        if batch:
+            batches.append(self.embedding_model.encode(batch))
+        if not chunks:
+            raise ValueError(f"No text could be extracted from {os.path.basename(file_path)}")
+        embeddings = np.vstack(batches).astype('float32')
+
+        self._save_cache(cache_path, pages, chunks, embeddings, terms)
+        # Hold the vectors memory-mapped from the cache like restored documents, not as a RAM copy
+        embeddings_path = os.path.join(cache_path, "embeddings.npy")
+        if os.path.exists(embeddings_path):
+            embeddings = np.load(embeddings_path, mmap_mode='r')
+        return pages, chunks, embeddings, terms
+
+    def _token_offsets(self, text):
+        """Character offsets of the embedding model's tokens"""
+        encoding = self.embedding_model.tokenizer(
+            text, add_special_tokens=False, return_offsets_mapping=True, verbose=False
+        )
+        return encoding["offset_mapping"]
+
+    def _cache_path(self, doc_id):
+        return os.path.join(self.cache_dir, f"{doc_id}-{self.embedding_fingerprint}")
+
+    def _load_cache(self, cache_path):
+        """Read page text, chunk spans, memory-mapped embeddings and term counts from a cache entry"""
+        from .processor import Chunk
+
+        embeddings_path = os.path.join(cache_path, "embeddings.npy")
+        chunks_path = os.path.join(cache_path, "chunks.json")
+        if not (os.path.exists(embeddings_path) and os.path.exists(chunks_path)):
+            return None
+
+        embeddings = np.load(embeddings_path, mmap_mode='r')
+        with open(chunks_path, 'r', encoding='utf-8') as f:
+            cached = json.load(f)
+        pages = {int(page): text for page, text in cached["pages"].items()}
+        chunks = [Chunk(*chunk) for chunk in cached["chunks"]]
+
+        terms_path = os.path.join(cache_path, "terms.json")
+        if os.path.exists(terms_path):
+            with open(terms_path, 'r', encoding='utf-8') as f:
+                terms = json.load(f)
+        else:
+            # Entries written before hybrid search: count terms once and persist them
+            terms = [term_frequencies(pages[chunk.page][chunk.start:chunk.end]) for chunk in chunks]
+            self._write_json(terms_path, terms)
+        return pages, chunks, embeddings, terms
+
+    def _save_cache(self, cache_path, pages, chunks, embeddings, terms):
+        """Atomically write a document's page text, chunk spans, embeddings and term counts to a cache entry"""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_path = tempfile.mkdtemp(dir=self.cache_dir)
+        try:
+            np.save(os.path.join(tmp_path, "embeddings.npy"), embeddings)
+            with open(os.path.join(tmp_path, "chunks.json"), 'w', encoding='utf-8') as f:
+                json.dump({"pages": pages, "chunks": [list(chunk) for chunk in chunks]}, f)
+            with open(os.path.join(tmp_path, "terms.json"), 'w', encoding='utf-8') as f:
+                json.dump(terms, f)
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            # Another session already populated this entry
+            shutil.rmtree(tmp_path, ignore_errors=True)
+
+    def _write_json(self, path, data):
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(data, f)
+        os.replace(tmp_path, path)
+
+    def search(self, query, k=3, mode="dense", candidates=20, return_embedding=False):
+        """Find relevant policy sections (mode="dense" or "hybrid" dense + BM25)
+
+        With return_embedding=True returns (results, query_vector) so the vector
+        can be reused by assemble_context.
+        """
+        results, query_embeddings = self.search_batch(
+            [query], k=k, mode=mode, candidates=candidates, return_embeddings=True
+        )
+        return (results[0], query_embeddings[0]) if return_embedding else results[0]
+
+    def search_batch(self, queries, k=3, mode="dense", candidates=20, return_embeddings=False):
+        """Find relevant policy sections for many queries with one embedding call and one FAISS search"""
+        if self.index is None or not self.metadata:
+            raise ValueError("No policy loaded. Please upload and load a policy document first.")
+        if mode not in ("dense", "hybrid"):
+            raise ValueError(f"Unknown search mode: {mode}")
+
+        query_embeddings = np.asarray(
+            self.embedding_model.encode(list(queries), batch_size=EMBED_BATCH_SIZE), dtype='float32'
+        )
+        n_dense = k if mode == "dense" else max(k, candidates)
+        distances, indices = self.index.search(np.ascontiguousarray(query_embeddings), n_dense)
+
+        batch_results = []
+        for query, row_distances, row_indices in zip(queries, distances, indices.tolist()):
+            dense = {idx: float(distance) for distance, idx in zip(row_distances, row_indices) if idx >= 0}
+            if mode == "dense":
+                batch_results.append([self._result(idx, distance=distance) for idx, distance in dense.items()])
+                continue
+
+            # Reciprocal-rank fusion of the top candidates from each retriever
+            lexical = self.bm25.search(query, max(k, candidates))
+            fused = reciprocal_rank_fusion([list(dense), [idx for idx, _ in lexical]])
+            batch_results.append([
+                self._result(idx, distance=dense.get(idx), score=score) for idx, score in fused[:k]
+            ])
+        return (batch_results, query_embeddings) if return_embeddings else batch_results
+
+    def _result(self, section_id, **scores):
+        meta = self.metadata[section_id]
+        return {
+            "id": section_id,
+            "content": self.section_text(section_id),
+            "source": self.source(section_id),
+            **scores,
+            "document": self.documents[meta["document"]]["name"],
+            "page": meta["page"],
+            "start": meta["start"],
+            "end": meta["end"]
+        }
+
+    def section_text(self, section_id):
+        """Text of an indexed section, sliced from its page"""
+        meta = self.metadata[section_id]
+        page_text = self.documents[meta["document"]]["pages"][meta["page"]]
+        return page_text[meta["start"]:meta["end"]]
+
+    def source(self, section_id):
+        """Citation label for an indexed section"""
+        meta = self.metadata[section_id]
+        return f"{self.documents[meta['document']]['name']} - Section {meta['section']} (p. {meta['page']})"
+
+    def section_embeddings(self, section_ids):
+        """Stored embeddings of indexed sections, in the given order"""
+        rows = []
+        for section_id in section_ids:
+            meta = self.metadata[section_id]
+            rows.append(self.documents[meta["document"]]["embeddings"][meta["section"] - 1])
+        return np.asarray(rows, dtype='float32')
+
+    def count_tokens(self, text):
+        """Approximate prompt token count using the embedding tokenizer"""
+        return len(self.embedding_model.tokenizer(text, add_special_tokens=False, verbose=False)["input_ids"])
+
+    def assemble_context(self, query, results, token_budget=1500, diversity=0.3, duplicate_threshold=0.95,
+                         query_vector=None):
+        """Pack search results into a token-budgeted context, dropping redundant sections
+
+        Returns (context, used_results, stats) where stats reports tokens before
+        and after packing and how many sections were dropped. Pass the
+        query_vector from search(..., return_embedding=True) to reuse it
+        instead of embedding the query again.
+        """
+        naive = "\n\n".join(_format_section(r["source"], r["content"]) for r in results)
+        stats = {"tokens_before": self.count_tokens(naive) if results else 0}
+
+        # MMR over stored section embeddings; near-duplicates are dropped outright
+        order = []
+        if results:
+            vectors = _normalize(self.section_embeddings([r["id"] for r in results]))
+            if query_vector is None:
+                query_vector = self.embedding_model.encode([query])[0]
+            query_vector = _normalize(np.asarray(query_vector, dtype='float32').reshape(1, -1))[0]
+            relevance = vectors @ query_vector
+            similarity = vectors @ vectors.T
+            remaining = list(range(len(results)))
+            while remaining:
+                redundancy = [similarity[i, order].max() if order else 0.0 for i in remaining]
+                scores = [(1 - diversity) * relevance[i] - diversity * r for i, r in zip(remaining, redundancy)]
+                best = int(np.argmax(scores))
+                candidate = remaining.pop(best)
+                if redundancy[best] < duplicate_threshold:
+                    order.append(candidate)
+
+        query_terms = set(tokenize(query))
+        blocks, used, tokens_used = [], [], 0
+        for i in order:
+            result = results[i]
+            block = _format_section(result["source"], result["content"])
+            block_tokens = self.count_tokens(block)
+            if tokens_used + block_tokens > token_budget:
+                # Keep only the sentences that share the most terms with the query
+                header_tokens = self.count_tokens(_format_section(result["source"], ""))
+                content = self._trim_sentences(
+                    result["content"], query_terms, token_budget - tokens_used - header_tokens
+                )
+                if not content:
+                    continue
+                block = _format_section(result["source"], content)
+                block_tokens = self.count_tokens(block)
+            blocks.append(block)
+            used.append(result)
+            tokens_used += block_tokens
+
+        context = "\n\n".join(blocks)
+        stats["tokens_after"] = self.count_tokens(context) if blocks else 0
+        stats["tokens_saved"] = stats["tokens_before"] - stats["tokens_after"]
+        stats["sections_dropped"] = len(results) - len(used)
+        return context, used, stats
+
+    def _trim_sentences(self, text, query_terms, budget):
+        if budget <= 0:
+            return ""
+        sentences = [s for s in _SENTENCE_PATTERN.split(text) if s.strip()]
+        ranked = sorted(
+            range(len(sentences)),
+            key=lambda i: len(query_terms & set(tokenize(sentences[i]))),
+            reverse=True
+        )
+        kept, spent = set(), 0
+        for i in ranked:
+            if not query_terms & set(tokenize(sentences[i])):
+                break
+            cost = self.count_tokens(sentences[i])
+            if spent + cost <= budget:
+                kept.add(i)
+                spent += cost
+        return " ".join(sentences[i].strip() for i in sorted(kept))
+
+    def _build_prompt(self, query, context):
+        return f"""
+        You are an HR policy expert. Answer the user's question using ONLY the
         provided policy context. Always cite your source using the exact format: [Source: ...]
-        
+
         Policy Context:
         {context}
-        
+
         Question: {query}
         Answer:
         """
-        
-        response = self.llm.generate_content(prompt)
-        return response.text
\ No newline at end of file
+
+    def generate_response(self, query, context):
+        """Generate policy-compliant answer"""
+        response = self.llm.generate_content(self._build_prompt(query, context))
+        return response.text
+
+    def stream_response(self, query, context):
+        """Yield the policy-compliant answer as Gemini generates it"""
+        response = self.llm.generate_content(self._build_prompt(query, context), stream=True)
+        for chunk in response:
+            # Chunks carrying only safety or finish metadata have no text parts
+            if chunk.parts:
+                yield chunk.text
@@ -0,0 +1,129 @@
+from collections import OrderedDict
+import os
+import re
+import threading
+from .embedders import load_embedder
+from .rag import PolicyAssistant
+
+# No leading dot, so "." and ".." (and hidden directories) are not tenant names
+_TENANT_PATTERN = re.compile(r"^[A-Za-z0-9_-][A-Za-z0-9_.-]*$")
+
+class TenantIndexManager:
+    """Per-tenant policy corpora kept on disk and loaded on demand under a memory ceiling"""
+
+    def __init__(self, root_dir=".tenants", max_memory_bytes=2 * 1024 ** 3, cache_dir=".index_cache",
+                 **assistant_options):
+        self.root_dir = root_dir
+        self.max_memory_bytes = max_memory_bytes
+        self.cache_dir = cache_dir
+        self.assistant_options = assistant_options
+        self._assistants = OrderedDict()
+        self._embedding_model = None
+        # The global lock only guards the resident map and eviction; restoring and
+        # ingesting hold a per-tenant lock so slow tenants do not block the others
+        self._lock = threading.RLock()
+        self._tenant_locks = {}
+        self._embedder_lock = threading.Lock()
+
+    @property
+    def embedding_model(self):
+        # One embedder is shared by every tenant
+        with self._embedder_lock:
+            if self._embedding_model is None:
+                self._embedding_model = load_embedder(
+                    self.assistant_options.get("embedding_backend") or os.getenv("EMBEDDING_BACKEND", "torch"),
+                    self.assistant_options.get("onnx_model_path") or os.getenv("ONNX_MODEL_PATH")
+                )
+            return self._embedding_model
+
+    def _shared_embedder(self):
+        return self.embedding_model
+
+    def tenant_dir(self, tenant):
+        if not _TENANT_PATTERN.match(tenant):
+            raise ValueError(f"Invalid tenant name: {tenant}")
+        path = os.path.join(self.root_dir, tenant)
+        root = os.path.realpath(self.root_dir)
+        if os.path.dirname(os.path.realpath(path)) != root:
+            raise ValueError(f"Invalid tenant name: {tenant}")
+        return path
+
+    def list_tenants(self):
+        """Tenants with a saved corpus on disk"""
+        if not os.path.isdir(self.root_dir):
+            return []
+        return sorted(name for name in os.listdir(self.root_dir)
+                      if os.path.exists(os.path.join(self.root_dir, name, "manifest.json")))
+
+    def _tenant_lock(self, tenant):
+        with self._lock:
+            return self._tenant_locks.setdefault(tenant, threading.RLock())
+
+    def _resident(self, tenant):
+        with self._lock:
+            assistant = self._assistants.get(tenant)
+            if assistant is not None:
+                self._assistants.move_to_end(tenant)
+            return assistant
+
+    def get(self, tenant):
+        """Return the tenant's assistant, loading it from disk if it is not resident"""
+        tenant_dir = self.tenant_dir(tenant)
+        assistant = self._resident(tenant)
+        if assistant is not None:
+            return assistant
+
+        with self._tenant_lock(tenant):
+            # Another request may have restored it while this one waited
+            assistant = self._resident(tenant)
+            if assistant is not None:
+                return assistant
+
+            # The shared embedder is only loaded once a tenant embeds a document or a query
+            assistant = PolicyAssistant(
+                cache_dir=self.cache_dir, embedding_provider=self._shared_embedder, **self.assistant_options
+            )
+            assistant.restore(tenant_dir)
+            with self._lock:
+                self._assistants[tenant] = assistant
+                self._evict()
+            return assistant
+
+    def add_document(self, tenant, file_path, name=None):
+        """Add a document to a tenant's corpus and persist it"""
+        with self._tenant_lock(tenant):
+            assistant = self.get(tenant)
+            known = set(assistant.documents)
+            doc_id = assistant.add_document(file_path, name)
+            if doc_id not in known:
+                assistant.save(self.tenant_dir(tenant))
+                with self._lock:
+                    self._evict()
+            return doc_id
+
+    def remove_document(self, tenant, document):
+        """Remove a document from a tenant's corpus and persist it"""
+        with self._tenant_lock(tenant):
+            assistant = self.get(tenant)
+            assistant.remove_document(document)
+            assistant.save(self.tenant_dir(tenant))
+
+    def memory_usage(self):
+        """Estimated bytes held by resident tenants"""
+        with self._lock:
+            return {tenant: assistant.memory_usage() for tenant, assistant in self._assistants.items()}
+
+    def unload(self, tenant):
+        """Drop a tenant from memory; its corpus stays on disk"""
+        with self._lock:
+            self._assistants.pop(tenant, None)
+
+    def _evict(self):
+        # Called with self._lock held. Least recently used tenants go first; the most
+        # recent one always stays. An evicted tenant that is mid-ingest finishes and
+        # saves under its own lock, and the next get() restores it from disk.
+        usage = {tenant: assistant.memory_usage() for tenant, assistant in self._assistants.items()}
+        total = sum(usage.values())
+        while total > self.max_memory_bytes and len(self._assistants) > 1:
+            tenant, _ = self._assistants.popitem(last=False)
+            total -= usage[tenant]
@@ -1,22 +1,23 @@
 import streamlit as st
 from src.agent.react_loop import react_agent
-from fpdf import FPDF
+from src.tools.scrape_site import cache_stats
+from src.utils.report import build_report_md, render_pdf
+
+@st.cache_data(max_entries=256, show_spinner=False)
+def cached_pdf(book, qa_pairs):
+    # Keyed by the title and the hash of the answers; nothing touches the filesystem
+    return render_pdf(build_report_md(book, qa_pairs))
 
 st.title("\ud83d\udcda Book Summary Generator (ReAct Agent)")
 book = st.text_input("Enter Book Title")
 
 if st.button("Generate Summary") and book:
     sid, qa_pairs = react_agent(book)
-    report_md = f"# Book Summary: {book}\n\n## Key Questions and Answers\n"
-    for q, a in qa_pairs:
-        report_md += f"- Q: {q}\n  A: {a}\n"
+    report_md = build_report_md(book, qa_pairs)
 
     st.markdown(report_md)
-    with open("summary.pdf", "wb") as f:
-        pdf = FPDF()
-        pdf.add_page()
-        pdf.set_font("Arial", size=12)
-        for line in report_md.split('\n'):
-            pdf.cell(200, 10, txt=line, ln=True)
-        pdf.output(f)
-    st.download_button("Download PDF", data=open("summary.pdf", "rb"), file_name="summary.pdf")
+    stats = cache_stats()
+    st.caption(f"Scrape cache: {stats['hit_rate']:.0%} hit rate "
+               f"({stats['hits']} fresh, {stats['revalidated']} revalidated, {stats['misses']} fetched)")
+    pdf_bytes = cached_pdf(book, tuple(qa_pairs))
+    st.download_button("Download PDF", data=pdf_bytes, file_name="summary.pdf", mime="application/pdf")
@@ -0,0 +1,48 @@
+"""
+Compare the per-question answering loop with batched answering
+
+Usage:
+    python benchmark_answering.py "The Alchemist"
+"""
+import sys
+import time
+from src.tools.search_summary import search_summary
+from src.tools.scrape_site import scrape_sites
+from src.tools.generate_questions import generate_questions
+from src.tools.answer_questions import token_usage, answer_questions, answer_questions_batch
+
+def sequential(text, questions):
+    # The original loop: one blocking request per question
+    started = time.perf_counter()
+    input_tokens = output_tokens = 0
+    for q in questions:
+        tokens_in, tokens_out = token_usage(answer_questions(text, q))
+        input_tokens += tokens_in
+        output_tokens += tokens_out
+    return {
+        "mode": "sequential",
+        "requests": len(questions),
+        "seconds": time.perf_counter() - started,
+        "input_tokens": input_tokens,
+        "output_tokens": output_tokens
+    }
+
+def main():
+    book_title = " ".join(sys.argv[1:]) or "The Alchemist"
+    sources = list(scrape_sites(search_summary(book_title)).values())
+    if not sources:
+        sys.exit("No source could be scraped")
+    questions = [q.strip() for q in generate_questions(book_title).content.strip().split("\n") if q.strip()]
+
+    baseline = sequential(sources[0], questions)
+    reports = [baseline] + [answer_questions_batch(sources[0], questions, mode=mode)[1]
+                            for mode in ("parallel", "packed")]
+
+    baseline_tokens = baseline["input_tokens"] + baseline["output_tokens"]
+    for report in reports:
+        tokens = report["input_tokens"] + report["output_tokens"]
+        print(f"{report['mode']:>10}: {report['seconds']:6.2f}s, {report['requests']} requests, "
+              f"{tokens} tokens ({baseline_tokens - tokens:+d} saved vs sequential)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,29 @@
+"""
+Check that paragraph extraction returns article text for real source pages
+
+Usage:
+    python check_extraction.py [url ...]
+"""
+import sys
+import requests
+from src.tools.scrape_site import CHUNK_SIZE, extract_stream
+
+DEFAULT_URLS = [
+    "https://en.wikipedia.org/wiki/The_Alchemist_(novel)",
+    "https://www.sparknotes.com/lit/alchemist/summary/",
+]
+
+def main():
+    failed = 0
+    for url in sys.argv[1:] or DEFAULT_URLS:
+        # Bypasses the scrape cache so a stale empty entry cannot hide a regression
+        with requests.get(url, timeout=10, stream=True, headers={"User-Agent": "Mozilla/5.0"}) as resp:
+            resp.raise_for_status()
+            text = extract_stream(resp.iter_content(CHUNK_SIZE), resp.encoding)
+        status = "ok" if text else "EMPTY"
+        failed += not text
+        print(f"{status:>5}: {len(text):5d} chars  {url}\n       {text[:120]!r}")
+    sys.exit(1 if failed else 0)
+
+if __name__ == "__main__":
+    main()
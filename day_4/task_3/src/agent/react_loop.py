@@ -1,31 +1,39 @@
 from src.tools.search_summary import search_summary
-from src.tools.scrape_site import scrape_site
+from src.tools.scrape_site import scrape_sites
 from src.tools.generate_questions import generate_questions
-from src.tools.answer_questions import answer_questions
+from src.tools.answer_questions import token_usage, answer_questions_batch
+from src.tools.retrieve_passages import format_passages, retrieve_passages
 from src.utils.token_tracker import log_token_count
 
 import uuid
 
-def react_agent(book_title):
+def react_agent(book_title, answer_mode="parallel"):
     session_id = str(uuid.uuid4())
-    token_total = 0
-    summary_data = []
+    input_tokens = output_tokens = 0
 
+    # Fetch every source concurrently; slow sites are dropped at the deadline
     urls = search_summary(book_title)
-    for name, url in urls.items():
-        text = scrape_site(url)
-        if "Error" not in text:
-            summary_data.append((name, text))
+    summary_data = list(scrape_sites(urls).items())
 
-    questions = generate_questions(book_title).strip().split("\n")
+    question_message = generate_questions(book_title)
+    tokens_in, tokens_out = token_usage(question_message)
+    input_tokens += tokens_in
+    output_tokens += tokens_out
+    questions = [q.strip() for q in question_message.content.strip().split("\n") if q.strip()]
     answers = []
 
-    for q in questions:
-        for name, text in summary_data:
-            ans = answer_questions(text, q)
-            token_total += len(ans.split()) + len(q.split())
-            answers.append((q, ans))
-            break  # stop at first successful
+    # Ground each question in its own top passages drawn from every source
+    if summary_data:
+        passages = retrieve_passages(summary_data, questions)
+        if answer_mode == "packed":
+            contexts = format_passages(dict.fromkeys(p for selected in passages for p in selected))
+        else:
+            contexts = [format_passages(selected) for selected in passages]
+        replies, stats = answer_questions_batch(contexts, questions, mode=answer_mode)
+        input_tokens += stats["input_tokens"]
+        output_tokens += stats["output_tokens"]
+        answers = list(zip(questions, replies))
 
-    log_token_count(session_id, token_total)
+    # API-reported usage, written in the background
+    log_token_count(session_id, input_tokens + output_tokens, input_tokens, output_tokens)
     return session_id, answers
@@ -1,11 +1,16 @@
 from langchain_core.prompts import PromptTemplate
 from langchain_google_genai import ChatGoogleGenerativeAI
+from pydantic import BaseModel, Field
+from typing import List
 import os
+import time
 from dotenv import load_dotenv
 load_dotenv()
 
-def answer_questions(text_chunk, question):
-    prompt = PromptTemplate.from_template("""
+# One client shared by every call
+llm = ChatGoogleGenerativeAI(model="gemini-1.5-flash", temperature=0.3, google_api_key=os.getenv("GEMINI_API_KEY"))
+
+prompt = PromptTemplate.from_template("""
     Context:
     {text_chunk}
 
@@ -14,5 +19,73 @@ def answer_questions(text_chunk, question):
 
     Provide a clear and concise answer.
     """)
-    chain = prompt | ChatGoogleGenerativeAI(model="gemini-1.5-flash", temperature=0.3, google_api_key=os.getenv("GEMINI_API_KEY"))
+chain = prompt | llm
+
+packed_prompt = PromptTemplate.from_template("""
+    Context:
+    {text_chunk}
+
+    Questions:
+    {questions}
+
+    Provide a clear and concise answer to each question, in the same order.
+    """)
+
+class PackedAnswers(BaseModel):
+    answers: List[str] = Field(description="One answer per question, in the order the questions were given")
+
+packed_chain = packed_prompt | llm.with_structured_output(PackedAnswers, include_raw=True)
+
+def token_usage(message):
+    """(input_tokens, output_tokens) reported by Gemini on a chat message, zeros when absent"""
+    usage = getattr(message, "usage_metadata", None) or {}
+    return usage.get("input_tokens", 0), usage.get("output_tokens", 0)
+
+def answer_questions(text_chunk, question):
     return chain.invoke({"text_chunk": text_chunk, "question": question})
+
+def answer_questions_batch(contexts, questions, mode="parallel", max_concurrency=5):
+    """Answer several questions at once.
+
+    contexts is one context string shared by every question or a list with one per
+    question. mode="parallel" runs one request per question concurrently;
+    mode="packed" asks every question in a single structured-output request (shared
+    context only). Returns (answers, stats) with wall-clock seconds and token usage.
+    """
+    if isinstance(contexts, str):
+        contexts = [contexts] * len(questions)
+    started = time.perf_counter()
+    input_tokens = output_tokens = 0
+
+    if mode == "parallel":
+        messages = chain.batch(
+            [{"text_chunk": c, "question": q} for c, q in zip(contexts, questions)],
+            config={"max_concurrency": max_concurrency}
+        )
+        answers = [m.content for m in messages]
+        for m in messages:
+            tokens_in, tokens_out = token_usage(m)
+            input_tokens += tokens_in
+            output_tokens += tokens_out
+        requests = len(questions)
+    elif mode == "packed":
+        if len(set(contexts)) > 1:
+            raise ValueError("packed mode needs one context shared by every question")
+        numbered = "\n".join(f"{i + 1}. {q}" for i, q in enumerate(questions))
+        result = packed_chain.invoke({"text_chunk": contexts[0] if contexts else "", "questions": numbered})
+        parsed = result["parsed"]
+        answers = list(parsed.answers) if parsed else []
+        answers = (answers + [""] * len(questions))[:len(questions)]
+        input_tokens, output_tokens = token_usage(result["raw"])
+        requests = 1
+    else:
+        raise ValueError(f"Unknown answering mode: {mode}")
+
+    stats = {
+        "mode": mode,
+        "requests": requests,
+        "seconds": time.perf_counter() - started,
+        "input_tokens": input_tokens,
+        "output_tokens": output_tokens
+    }
+    return answers, stats
@@ -0,0 +1,51 @@
+from langchain_google_genai import GoogleGenerativeAIEmbeddings
+import numpy as np
+import os
+from dotenv import load_dotenv
+load_dotenv()
+
+CHUNK_WORDS = 150
+OVERLAP_WORDS = 30
+# ~1k tokens of context per question
+MAX_CONTEXT_CHARS = 4000
+
+embeddings = GoogleGenerativeAIEmbeddings(model="models/embedding-001", google_api_key=os.getenv("GEMINI_API_KEY"))
+
+def chunk_sources(summary_data, chunk_words=CHUNK_WORDS, overlap=OVERLAP_WORDS):
+    """Split every (source name, text) pair into overlapping word windows"""
+    passages = []
+    for name, text in summary_data:
+        words = text.split()
+        for start in range(0, max(len(words) - overlap, 1), chunk_words - overlap):
+            passages.append((name, " ".join(words[start:start + chunk_words])))
+    return passages
+
+def _normalize(vectors):
+    vectors = np.asarray(vectors, dtype="float32")
+    return vectors / np.clip(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12, None)
+
+def retrieve_passages(summary_data, questions, k=4, max_chars=MAX_CONTEXT_CHARS):
+    """Return, for each question, the most similar (source, passage) pairs within max_chars"""
+    passages = [p for p in chunk_sources(summary_data) if p[1]]
+    if not passages or not questions:
+        return [[] for _ in questions]
+
+    # Embed all passages once and all questions in one call
+    passage_vectors = _normalize(embeddings.embed_documents([text for _, text in passages]))
+    question_vectors = _normalize(embeddings.embed_documents(list(questions)))
+    scores = question_vectors @ passage_vectors.T
+
+    results = []
+    for row in scores:
+        selected, used = [], 0
+        for i in np.argsort(-row)[:k]:
+            name, text = passages[i]
+            if used + len(text) > max_chars and selected:
+                break
+            selected.append((name, text))
+            used += len(text)
+        results.append(selected)
+    return results
+
+def format_passages(passages):
+    return "\n\n".join(f"[{name}] {text}" for name, text in passages)
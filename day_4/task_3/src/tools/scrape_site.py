@@ -1,13 +1,188 @@
-from bs4 import BeautifulSoup
+from html.parser import HTMLParser
+from src.utils.scrape_cache import ScrapeCache
+import aiohttp
+import asyncio
+import codecs
 import requests
 
+MAX_CHARS = 5000
+CHUNK_SIZE = 16 * 1024
+
+# Elements whose text is navigation or page furniture rather than content
+SKIP_TAGS = {"nav", "header", "footer", "aside", "script", "style", "noscript", "form", "table", "figure", "sup"}
+# Matched as prefixes of whole class/id/role tokens, never as substrings of longer names
+SKIP_CLASS_PREFIXES = ("nav", "menu", "footer", "sidebar", "infobox", "reference", "reflist", "mw-references",
+                       "editsection", "mw-editsection", "hatnote", "cookie")
+# Page-level containers carry layout flags (e.g. Wikipedia's "vector-feature-main-menu-...") and are never skipped
+NEVER_SKIP_TAGS = {"html", "body", "main", "article"}
+VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "track", "wbr"}
+
+_cache = None
+
+def get_cache():
+    global _cache
+    if _cache is None:
+        _cache = ScrapeCache()
+    return _cache
+
+def _hinted(attrs):
+    tokens = f"{attrs.get('class') or ''} {attrs.get('id') or ''} {attrs.get('role') or ''}".lower().split()
+    return any(token.startswith(SKIP_CLASS_PREFIXES) for token in tokens)
+
+def cache_stats():
+    return get_cache().stats()
+
+class ParagraphExtractor(HTMLParser):
+    """Incremental <p> text extractor that skips boilerplate and stops at a character budget"""
+
+    def __init__(self, budget=MAX_CHARS):
+        super().__init__(convert_charrefs=True)
+        self.budget = budget
+        self.parts = []
+        self.length = 0
+        self._stack = []
+        self._skip_depth = 0
+        self._paragraph = None
+
+    @property
+    def done(self):
+        return self.length >= self.budget
+
+    def handle_starttag(self, tag, attrs):
+        if tag in VOID_TAGS:
+            return
+        if tag == "p" and self._paragraph is not None:
+            # An unclosed <p> ends where the next one starts
+            self.handle_endtag("p")
+        skipped = tag in SKIP_TAGS or (tag not in NEVER_SKIP_TAGS and _hinted(dict(attrs)))
+        self._stack.append((tag, skipped))
+        if skipped:
+            self._skip_depth += 1
+        elif tag == "p" and not self._skip_depth:
+            self._paragraph = []
+
+    def handle_endtag(self, tag):
+        if tag in VOID_TAGS or all(open_tag != tag for open_tag, _ in self._stack):
+            return
+        while self._stack:
+            open_tag, skipped = self._stack.pop()
+            if skipped:
+                self._skip_depth -= 1
+            if open_tag == "p" and self._paragraph is not None:
+                self._flush()
+            if open_tag == tag:
+                break
+
+    def handle_data(self, data):
+        if self._paragraph is not None and not self._skip_depth:
+            self._paragraph.append(data)
+
+    def _flush(self):
+        text = " ".join("".join(self._paragraph).split())
+        self._paragraph = None
+        if text:
+            self.parts.append(text)
+            self.length += len(text) + 1
+
+    def text(self):
+        if self._paragraph is not None:
+            self._flush()
+        return " ".join(self.parts)[:self.budget]
+
+def _decoder(encoding):
+    try:
+        return codecs.getincrementaldecoder(encoding or "utf-8")(errors="replace")
+    except LookupError:
+        return codecs.getincrementaldecoder("utf-8")(errors="replace")
+
+def extract_text(html, budget=MAX_CHARS):
+    parser = ParagraphExtractor(budget)
+    parser.feed(html)
+    return parser.text()
+
+def extract_stream(chunks, encoding=None, budget=MAX_CHARS):
+    """Extract text from an iterable of body bytes, reading no further than the budget needs"""
+    parser = ParagraphExtractor(budget)
+    decoder = _decoder(encoding)
+    for chunk in chunks:
+        parser.feed(decoder.decode(chunk))
+        if parser.done:
+            break
+    return parser.text()
+
+async def extract_stream_async(content, encoding=None, budget=MAX_CHARS):
+    parser = ParagraphExtractor(budget)
+    decoder = _decoder(encoding)
+    async for chunk in content.iter_chunked(CHUNK_SIZE):
+        parser.feed(decoder.decode(chunk))
+        if parser.done:
+            break
+    return parser.text()
+
 def scrape_site(url):
+    # Fresh cache entries skip the network; stale ones are revalidated
+    cache = get_cache()
+    entry = cache.get(url)
+    if cache.is_fresh(entry):
+        cache.record("hits")
+        return entry["text"]
     try:
-        resp = requests.get(url, timeout=10)
-        if resp.status_code == 200:
-            soup = BeautifulSoup(resp.text, 'html.parser')
-            text = ' '.join([p.text for p in soup.find_all('p')])
-            return text[:5000]  # Limit scrape
+        # Stream the body and stop downloading once the budget is filled
+        with requests.get(url, timeout=10, headers=cache.conditional_headers(entry), stream=True) as resp:
+            if resp.status_code == 304 and entry:
+                cache.touch(url)
+                cache.record("revalidated")
+                return entry["text"]
+            if resp.status_code == 200:
+                text = extract_stream(resp.iter_content(CHUNK_SIZE), resp.encoding)
+                cache.put(url, text, resp.headers.get("ETag"), resp.headers.get("Last-Modified"))
+                cache.record("misses")
+                return text
     except Exception as e:
         return f"Error: {str(e)}"
     return ""
+
+async def scrape_site_async(session, url):
+    cache = get_cache()
+    entry = cache.get(url)
+    if cache.is_fresh(entry):
+        cache.record("hits")
+        return entry["text"]
+    try:
+        async with session.get(url, headers=cache.conditional_headers(entry)) as resp:
+            if resp.status == 304 and entry:
+                cache.touch(url)
+                cache.record("revalidated")
+                return entry["text"]
+            if resp.status == 200:
+                text = await extract_stream_async(resp.content, resp.charset)
+                cache.put(url, text, resp.headers.get("ETag"), resp.headers.get("Last-Modified"))
+                cache.record("misses")
+                return text
+    except Exception as e:
+        return f"Error: {str(e)}"
+    return ""
+
+async def _scrape_sites(urls, deadline, per_host, timeout):
+    # One pooled session for every site, at most `per_host` connections to any host
+    connector = aiohttp.TCPConnector(limit=max(1, len(urls)), limit_per_host=per_host)
+    client_timeout = aiohttp.ClientTimeout(total=timeout)
+    async with aiohttp.ClientSession(connector=connector, timeout=client_timeout) as session:
+        tasks = {name: asyncio.create_task(scrape_site_async(session, url)) for name, url in urls.items()}
+        done, pending = await asyncio.wait(tasks.values(), timeout=deadline)
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+
+    # Partial results: keep sites that answered in time, in the original order
+    results = {}
+    for name, task in tasks.items():
+        if task in done:
+            text = task.result()
+            if text and not text.startswith("Error"):
+                results[name] = text
+    return results
+
+def scrape_sites(urls, deadline=15, per_host=2, timeout=10):
+    """Scrape {name: url} concurrently and return {name: text} for sites done before the deadline"""
+    return asyncio.run(_scrape_sites(urls, deadline, per_host, timeout))
@@ -0,0 +1,18 @@
+from fpdf import FPDF
+
+def build_report_md(book_title, qa_pairs):
+    report_md = f"# Book Summary: {book_title}\n\n## Key Questions and Answers\n"
+    for q, a in qa_pairs:
+        report_md += f"- Q: {q}\n  A: {a}\n"
+    return report_md
+
+def render_pdf(report_md):
+    """Render the report to PDF bytes in memory"""
+    pdf = FPDF()
+    pdf.add_page()
+    pdf.set_font("Arial", size=12)
+    for line in report_md.split('\n'):
+        # Core fonts are Latin-1 only; wrap long answers over several lines
+        pdf.multi_cell(0, 8, txt=line.encode("latin-1", "replace").decode("latin-1"))
+    data = pdf.output(dest="S")
+    return data.encode("latin-1") if isinstance(data, str) else bytes(data)
@@ -0,0 +1,73 @@
+import os
+import sqlite3
+import threading
+import time
+
+class ScrapeCache:
+    """SQLite store of extracted page text keyed by URL, with validators for conditional GETs"""
+
+    def __init__(self, path=None, ttl=None):
+        self.path = path or os.getenv("SCRAPE_CACHE_PATH", ".scrape_cache.sqlite3")
+        self.ttl = ttl if ttl is not None else int(os.getenv("SCRAPE_CACHE_TTL", 24 * 3600))
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS pages (
+                url TEXT PRIMARY KEY,
+                text TEXT NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                fetched_at REAL NOT NULL
+            )
+        """)
+        self._conn.commit()
+        self.counters = {"hits": 0, "revalidated": 0, "misses": 0}
+
+    def get(self, url):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT text, etag, last_modified, fetched_at FROM pages WHERE url = ?", (url,)
+            ).fetchone()
+        if row is None or not row[0]:
+            # Empty extractions (JS-rendered pages) are refetched rather than served or revalidated
+            return None
+        return {"text": row[0], "etag": row[1], "last_modified": row[2], "fetched_at": row[3]}
+
+    def is_fresh(self, entry):
+        return entry is not None and time.time() - entry["fetched_at"] < self.ttl
+
+    def conditional_headers(self, entry):
+        headers = {}
+        if entry and entry["etag"]:
+            headers["If-None-Match"] = entry["etag"]
+        if entry and entry["last_modified"]:
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def put(self, url, text, etag=None, last_modified=None):
+        if not text:
+            return
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO pages (url, text, etag, last_modified, fetched_at) VALUES (?, ?, ?, ?, ?)",
+                (url, text, etag, last_modified, time.time())
+            )
+            self._conn.commit()
+
+    def touch(self, url):
+        """Mark an entry fresh again after a 304 Not Modified"""
+        with self._lock:
+            self._conn.execute("UPDATE pages SET fetched_at = ? WHERE url = ?", (time.time(), url))
+            self._conn.commit()
+
+    def record(self, outcome):
+        with self._lock:
+            self.counters[outcome] += 1
+
+    def stats(self):
+        with self._lock:
+            counters = dict(self.counters)
+        lookups = sum(counters.values())
+        # Revalidated entries are served from cache too, only the body download is saved
+        counters["hit_rate"] = (counters["hits"] + counters["revalidated"]) / lookups if lookups else 0.0
+        return counters
@@ -1,9 +1,118 @@
+import atexit
 import os
-from pymongo import MongoClient
+import queue
+import sqlite3
+import threading
+import time
 
-client = MongoClient(os.getenv("MONGO_URI"))
-db = client[os.getenv("MONGO_DB")]
-coll = db[os.getenv("MONGO_COLLECTION")]
+class MongoSink:
+    """Bulk inserts into the MONGO_URI / MONGO_DB / MONGO_COLLECTION collection"""
 
-def log_token_count(session_id, token_count):
-    coll.insert_one({"session": session_id, "tokens": token_count})
+    def __init__(self):
+        from pymongo import MongoClient
+        client = MongoClient(os.getenv("MONGO_URI"))
+        self.coll = client[os.getenv("MONGO_DB")][os.getenv("MONGO_COLLECTION")]
+
+    def write(self, records):
+        self.coll.insert_many([dict(r) for r in records], ordered=False)
+
+class SQLiteSink:
+    """Local file sink for offline runs"""
+
+    def __init__(self, path=None):
+        self.path = path or os.getenv("TOKEN_LOG_PATH", "token_usage.sqlite3")
+        self.conn = None
+
+    def write(self, records):
+        # Opened lazily so the connection belongs to the writer thread
+        if self.conn is None:
+            self.conn = sqlite3.connect(self.path)
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS token_usage (
+                    session TEXT, tokens INTEGER, input_tokens INTEGER, output_tokens INTEGER, logged_at REAL
+                )
+            """)
+        self.conn.executemany(
+            "INSERT INTO token_usage VALUES (?, ?, ?, ?, ?)",
+            [(r["session"], r["tokens"], r.get("input_tokens"), r.get("output_tokens"), r["logged_at"])
+             for r in records]
+        )
+        self.conn.commit()
+
+class TokenLogger:
+    """Queues token-usage records and bulk-writes them from a background thread"""
+
+    _STOP = object()
+
+    def __init__(self, sink, fallback=None, max_buffer=10000, batch_size=500, flush_interval=2.0):
+        self.sink = sink
+        self.fallback = fallback
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.dropped = 0
+        self._queue = queue.Queue(maxsize=max_buffer)
+        self._thread = threading.Thread(target=self._run, name="token-logger", daemon=True)
+        self._thread.start()
+
+    def log(self, record):
+        """Enqueue a record without blocking; drops it if the buffer is full"""
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self, timeout=5.0):
+        """Flush buffered records and stop the writer thread"""
+        if self._thread.is_alive():
+            self._queue.put(self._STOP)
+            self._thread.join(timeout)
+
+    def _run(self):
+        batch = []
+        deadline = time.monotonic() + self.flush_interval
+        while True:
+            try:
+                item = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                item = None
+            if item is self._STOP:
+                self._flush(batch)
+                return
+            if item is not None:
+                batch.append(item)
+            if len(batch) >= self.batch_size or time.monotonic() >= deadline:
+                self._flush(batch)
+                batch = []
+                deadline = time.monotonic() + self.flush_interval
+
+    def _flush(self, batch):
+        if not batch:
+            return
+        try:
+            self.sink.write(batch)
+        except Exception:
+            # Keep the records locally rather than lose them when the database is unreachable
+            if self.fallback is not None:
+                self.fallback.write(batch)
+
+_logger = None
+_logger_lock = threading.Lock()
+
+def get_logger():
+    global _logger
+    with _logger_lock:
+        if _logger is None:
+            local = SQLiteSink()
+            sink = MongoSink() if os.getenv("MONGO_URI") else local
+            _logger = TokenLogger(sink, fallback=local if sink is not local else None)
+            atexit.register(_logger.close)
+        return _logger
+
+def log_token_count(session_id, token_count, input_tokens=None, output_tokens=None):
+    get_logger().log({
+        "session": session_id,
+        "tokens": token_count,
+        "input_tokens": input_tokens,
+        "output_tokens": output_tokens,
+        "logged_at": time.time()
+    })
@@ -1,9 +1,9 @@
 import streamlit as st
-from src.loader import load_pdf_text
-from src.vector_store import store_docs, retrieve_similar_chunks
-from src.agent import generate_summary
+from src.corpus import add_paper, list_papers
+from src.agent import generate_review, summarize_document
 from src.session_handler import get_session_token
 import os
+import re
 
 st.set_page_config(page_title="LitReview Compiler", layout="wide")
 st.title("📚 LangChain LitReview Compiler")
@@ -19,15 +19,32 @@ if uploaded_file:
     st.success("PDF uploaded and saved.")
 
     with st.spinner("Processing PDF..."):
-        docs = load_pdf_text(pdf_path)
-        store_docs(docs)
-        chunks = retrieve_similar_chunks(docs)
-        summary = generate_summary(chunks, session_token)
+        # Appended to the persistent corpus; known papers are not re-embedded
+        doc_hash, title, docs = add_paper(pdf_path)
+        summary = summarize_document(docs, session_token, doc_hash=doc_hash)
 
-    output_path = os.path.join("output", "final_summary.md")
+    # One output file per document
+    os.makedirs("output", exist_ok=True)
+    slug = re.sub(r"[^A-Za-z0-9]+", "_", title).strip("_")[:60] or "summary"
+    output_name = f"{slug}_{doc_hash[:8]}.md"
+    output_path = os.path.join("output", output_name)
     with open(output_path, "w", encoding="utf-8") as f:
         f.write(summary)
 
     st.markdown("### ✅ Summary:")
     st.markdown(summary)
-    st.download_button("Download Summary", summary, file_name="final_summary.md")
+    st.download_button("Download Summary", summary, file_name=output_name)
+
+# Literature review across every ingested paper
+papers = list_papers()
+st.sidebar.markdown(f"### 📑 Corpus: {len(papers)} papers")
+for paper in papers:
+    st.sidebar.caption(f"{paper['title']} — {paper['authors'] or 'Unknown authors'} ({paper['pages']} pages)")
+
+topic = st.text_input("Literature review topic (searches all ingested papers)")
+if st.button("Compile Review") and topic:
+    with st.spinner("Retrieving across the corpus..."):
+        review = generate_review(topic, session_token)
+    st.markdown("### 🔎 Review:")
+    st.markdown(review)
+    st.download_button("Download Review", review, file_name="review.md")
@@ -1,13 +1,86 @@
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain.prompts import PromptTemplate
-from tools.prompts import SUMMARY_PROMPT
+from tools.prompts import MAP_PROMPT, REDUCE_PROMPT, SUMMARY_PROMPT
+from src.utils import count_tokens, split_by_tokens
+from src import summary_cache
 import os
 from dotenv import load_dotenv
 load_dotenv()
 
 llm = ChatGoogleGenerativeAI(model="gemini-pro", temperature=0.2, google_api_key=os.getenv("GEMINI_API_KEY"))
 prompt = PromptTemplate.from_template(SUMMARY_PROMPT)
+map_prompt = PromptTemplate.from_template(MAP_PROMPT)
+reduce_prompt = PromptTemplate.from_template(REDUCE_PROMPT)
+
+# Token budgets, measured with src.utils.count_tokens
+MAP_CHUNK_TOKENS = 3000
+REDUCE_BUDGET_TOKENS = 6000
+MAX_CONCURRENCY = 4
 
 def generate_summary(text, session_id):
     formatted = prompt.format(context=text, session=session_id)
     return llm.predict(formatted)
+
+def _run(template, contexts, max_concurrency):
+    # Bounded-concurrency fan-out over the shared client
+    messages = llm.batch(
+        [template.format(context=c) for c in contexts],
+        config={"max_concurrency": max_concurrency}
+    )
+    return [m.content for m in messages]
+
+def _group_by_budget(texts, budget):
+    groups, current, used = [], [], 0
+    for text in texts:
+        tokens = count_tokens(text)
+        if current and used + tokens > budget:
+            groups.append(current)
+            current, used = [], 0
+        current.append(text)
+        used += tokens
+    if current:
+        groups.append(current)
+    return groups
+
+def summarize_document(text, session_id, doc_hash=None, use_cache=True, chunk_tokens=MAP_CHUNK_TOKENS,
+                       reduce_budget=REDUCE_BUDGET_TOKENS, max_concurrency=MAX_CONCURRENCY):
+    """Summary of the whole document, served from the cache when the same document,
+    prompt templates, model, temperature and token budgets were summarized before"""
+    doc_hash = doc_hash or summary_cache.text_hash(text)
+    # Concurrency does not change the summary, so it stays out of the key
+    budgets = {"chunk_tokens": chunk_tokens, "reduce_budget": reduce_budget}
+    if use_cache:
+        cached = summary_cache.get_summary(doc_hash, llm.model, llm.temperature, budgets)
+        if cached is not None:
+            return cached
+    summary = map_reduce_summary(text, session_id, max_concurrency=max_concurrency, **budgets)
+    summary_cache.put_summary(doc_hash, llm.model, llm.temperature, summary, budgets)
+    return summary
+
+def map_reduce_summary(text, session_id, chunk_tokens=MAP_CHUNK_TOKENS,
+                       reduce_budget=REDUCE_BUDGET_TOKENS, max_concurrency=MAX_CONCURRENCY):
+    """Map-reduce summary covering the whole document.
+
+    Every chunk is summarized in parallel, partial summaries are merged level by
+    level until they fit the reduce budget, and the final structured summary is
+    written from the merged notes.
+    """
+    chunks = split_by_tokens(text, chunk_tokens)
+    if not chunks:
+        return generate_summary(text, session_id)
+
+    partials = _run(map_prompt, chunks, max_concurrency)
+    while len(partials) > 1 and count_tokens("\n\n".join(partials)) > reduce_budget:
+        groups = _group_by_budget(partials, reduce_budget)
+        if len(groups) == len(partials):
+            # Every partial is already at the budget; merging pairs still shrinks the tree
+            groups = [partials[i:i + 2] for i in range(0, len(partials), 2)]
+        partials = _run(reduce_prompt, ["\n\n".join(group) for group in groups], max_concurrency)
+
+    return generate_summary("\n\n".join(partials), session_id)
+
+def generate_review(topic, session_id, n_results=20):
+    """Literature review of a topic drawing on every paper in the corpus"""
+    from src.corpus import retrieve_across_papers
+    context = retrieve_across_papers(topic, n_results=n_results)
+    return generate_summary(f"Topic: {topic}\n\n{context}", session_id)
@@ -0,0 +1,58 @@
+from PyPDF2 import PdfReader
+from src.loader import load_pdf_pages
+from src.vector_store import chroma_client, document_hash, embedder, query_chunks, store_docs
+import os
+
+# One record per ingested paper, keyed by the same content hash as its chunks
+papers = chroma_client.get_or_create_collection(name="lit_papers_catalog")
+
+def _paper_details(pdf_path, pages):
+    info = PdfReader(pdf_path).metadata
+    title = (info.title if info else None) or ""
+    authors = (info.author if info else None) or ""
+    if not title.strip():
+        first_page = next((text for _, text in pages if text.strip()), "")
+        title = next((line.strip() for line in first_page.splitlines() if line.strip()), os.path.basename(pdf_path))
+    return title.strip()[:200], authors.strip()
+
+def add_paper(pdf_path):
+    """Append a paper to the corpus; papers already ingested cost no embedding work"""
+    pages = load_pdf_pages(pdf_path)
+    page_starts, parts, offset = [], [], 0
+    for page, text in pages:
+        if not text:
+            continue
+        page_starts.append((offset, page))
+        parts.append(text)
+        offset += len(text) + 1
+    text = "\n".join(parts)
+
+    doc_hash = document_hash(text)
+    existing = papers.get(ids=[doc_hash])
+    if existing["ids"]:
+        return doc_hash, existing["metadatas"][0]["title"], text
+
+    title, authors = _paper_details(pdf_path, pages)
+    store_docs(text, page_starts=page_starts, metadata={"title": title})
+    papers.upsert(
+        ids=[doc_hash],
+        documents=[title],
+        embeddings=embedder.encode([title]).tolist(),
+        metadatas=[{"title": title, "authors": authors, "pages": len(pages), "file": os.path.basename(pdf_path)}]
+    )
+    return doc_hash, title, text
+
+def list_papers():
+    records = papers.get()
+    return [{"id": doc_id, **meta} for doc_id, meta in zip(records["ids"], records["metadatas"])]
+
+def retrieve_across_papers(topic, n_results=20):
+    """Chunks from every ingested paper nearest to the topic, labelled with title and pages"""
+    passages = []
+    for document, meta in query_chunks(topic, n_results=n_results):
+        pages = meta.get("page_start")
+        if pages is not None and meta.get("page_end") != pages:
+            pages = f"{pages}-{meta['page_end']}"
+        label = f"{meta.get('title', meta['doc'][:8])}" + (f", p. {pages}" if pages is not None else "")
+        passages.append(f"[{label}]\n{document}")
+    return "\n\n".join(passages)
@@ -1,6 +1,70 @@
 from PyPDF2 import PdfReader
+from concurrent.futures import ProcessPoolExecutor
+import hashlib
+import os
+import sqlite3
 
-def load_pdf_text(file_path):
+# Pages are extracted in a process pool when at least this many need extracting
+PARALLEL_PAGE_THRESHOLD = 32
+PAGES_PER_TASK = 16
+
+PAGE_CACHE_PATH = os.getenv("PAGE_CACHE_PATH", ".page_cache.sqlite3")
+
+def file_hash(file_path, block_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def _connect():
+    conn = sqlite3.connect(PAGE_CACHE_PATH)
+    conn.execute("CREATE TABLE IF NOT EXISTS files (file_hash TEXT PRIMARY KEY, page_count INTEGER)")
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS pages (
+            file_hash TEXT, page INTEGER, text TEXT, PRIMARY KEY (file_hash, page)
+        )
+    """)
+    return conn
+
+def _extract_pages(file_path, pages):
+    # Each page's text is extracted exactly once
     reader = PdfReader(file_path)
-    text = "\n".join([page.extract_text() for page in reader.pages if page.extract_text()])
-    return text
+    return [(page, reader.pages[page - 1].extract_text() or "") for page in pages]
+
+def _extract(file_path, pages):
+    if len(pages) < PARALLEL_PAGE_THRESHOLD:
+        return _extract_pages(file_path, pages)
+    batches = [pages[i:i + PAGES_PER_TASK] for i in range(0, len(pages), PAGES_PER_TASK)]
+    with ProcessPoolExecutor() as executor:
+        results = executor.map(_extract_pages, [file_path] * len(batches), batches)
+        return [item for batch in results for item in batch]
+
+def load_pdf_pages(file_path):
+    """Return [(page_number, text)] for every page, extracting only pages not already cached"""
+    doc_hash = file_hash(file_path)
+    conn = _connect()
+    try:
+        row = conn.execute("SELECT page_count FROM files WHERE file_hash = ?", (doc_hash,)).fetchone()
+        if row is None:
+            page_count = len(PdfReader(file_path).pages)
+            conn.execute("INSERT OR REPLACE INTO files VALUES (?, ?)", (doc_hash, page_count))
+        else:
+            page_count = row[0]
+
+        cached = dict(conn.execute("SELECT page, text FROM pages WHERE file_hash = ?", (doc_hash,)))
+        missing = [page for page in range(1, page_count + 1) if page not in cached]
+        if missing:
+            extracted = _extract(file_path, missing)
+            conn.executemany(
+                "INSERT OR REPLACE INTO pages VALUES (?, ?, ?)",
+                [(doc_hash, page, text) for page, text in extracted]
+            )
+            cached.update(extracted)
+        conn.commit()
+    finally:
+        conn.close()
+    return [(page, cached[page]) for page in range(1, page_count + 1)]
+
+def load_pdf_text(file_path):
+    return "\n".join(text for _, text in load_pdf_pages(file_path) if text)
@@ -0,0 +1,82 @@
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from tools import prompts
+
+SUMMARY_CACHE_PATH = os.getenv("SUMMARY_CACHE_PATH", ".summary_cache.sqlite3")
+
+def prompt_hash():
+    """Hash of every template that shapes a summary; editing tools/prompts.py changes it"""
+    templates = [prompts.SUMMARY_PROMPT, prompts.MAP_PROMPT, prompts.REDUCE_PROMPT]
+    return hashlib.sha256("\x00".join(templates).encode("utf-8")).hexdigest()
+
+def options_key(options=None):
+    """Canonical form of the summarization options that change the output (e.g. token budgets)"""
+    return json.dumps(options or {}, sort_keys=True)
+
+def _connect():
+    conn = sqlite3.connect(SUMMARY_CACHE_PATH)
+    columns = [row[1] for row in conn.execute("PRAGMA table_info(summaries)")]
+    if columns and "options" not in columns:
+        # Rows written before options were part of the key cannot be matched reliably
+        conn.execute("DROP TABLE summaries")
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS summaries (
+            doc_hash TEXT, prompt_hash TEXT, model TEXT, temperature REAL, options TEXT, summary TEXT,
+            created_at REAL,
+            PRIMARY KEY (doc_hash, prompt_hash, model, temperature, options)
+        )
+    """)
+    return conn
+
+def get_summary(doc_hash, model, temperature, options=None):
+    conn = _connect()
+    try:
+        row = conn.execute(
+            "SELECT summary FROM summaries WHERE doc_hash = ? AND prompt_hash = ? AND model = ? AND temperature = ?"
+            " AND options = ?",
+            (doc_hash, prompt_hash(), model, temperature, options_key(options))
+        ).fetchone()
+    finally:
+        conn.close()
+    return row[0] if row else None
+
+def put_summary(doc_hash, model, temperature, summary, options=None):
+    conn = _connect()
+    try:
+        conn.execute(
+            "INSERT OR REPLACE INTO summaries VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (doc_hash, prompt_hash(), model, temperature, options_key(options), summary, time.time())
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+def invalidate(doc_hash=None, stale_only=True):
+    """Delete cached summaries written with older prompt templates (or all of them)
+
+    Scope to one document with doc_hash. Returns the number of rows removed.
+    """
+    clauses, params = [], []
+    if stale_only:
+        clauses.append("prompt_hash != ?")
+        params.append(prompt_hash())
+    if doc_hash:
+        clauses.append("doc_hash = ?")
+        params.append(doc_hash)
+    where = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+    conn = _connect()
+    try:
+        removed = conn.execute(f"DELETE FROM summaries{where}", params).rowcount
+        conn.commit()
+    finally:
+        conn.close()
+    return removed
+
+def text_hash(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+if __name__ == "__main__":
+    print(json.dumps({"removed_stale": invalidate()}))
@@ -1,5 +1,14 @@
 import tiktoken
 
+def _encoding():
+    return tiktoken.encoding_for_model("gpt-3.5-turbo")
+
 def count_tokens(text):
-    enc = tiktoken.encoding_for_model("gpt-3.5-turbo")
+    enc = _encoding()
     return len(enc.encode(text))
+
+def split_by_tokens(text, max_tokens):
+    """Split text into consecutive pieces of at most max_tokens tokens"""
+    enc = _encoding()
+    tokens = enc.encode(text)
+    return [enc.decode(tokens[i:i + max_tokens]) for i in range(0, len(tokens), max_tokens)]
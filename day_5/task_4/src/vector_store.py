@@ -1,17 +1,74 @@
 import chromadb
 from sentence_transformers import SentenceTransformer
+from bisect import bisect_right
+import hashlib
+import os
 
-chroma_client = chromadb.Client()
+CHUNK_CHARS = 500
+UPSERT_BATCH_SIZE = 256
+
+# Persistent store; every paper's chunks are namespaced by its content hash
+chroma_client = chromadb.PersistentClient(path=os.getenv("CHROMA_PATH", "chroma_db"))
 collection = chroma_client.get_or_create_collection(name="lit_papers")
 embedder = SentenceTransformer("all-MiniLM-L6-v2")
 
-def store_docs(text):
-    chunks = [text[i:i+500] for i in range(0, len(text), 500)]
-    embeddings = embedder.encode(chunks).tolist()
-    ids = [f"chunk_{i}" for i in range(len(chunks))]
-    collection.add(documents=chunks, embeddings=embeddings, ids=ids)
+def document_hash(text):
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+def _chunk_ids(doc_hash, count):
+    return [f"{doc_hash}:{i}" for i in range(count)]
+
+def is_indexed(doc_hash, chunk_count):
+    # Chunks are upserted in order, so the last one marks a complete document
+    if chunk_count == 0:
+        return True
+    return bool(collection.get(ids=_chunk_ids(doc_hash, chunk_count)[-1:])["ids"])
+
+def _page_at(page_starts, offset):
+    # page_starts holds (character offset, page number) pairs in order
+    return page_starts[max(0, bisect_right([start for start, _ in page_starts], offset) - 1)][1]
+
+def store_docs(text, page_starts=None, metadata=None):
+    """Index a paper's chunks under its content hash, skipping papers already stored
+
+    page_starts, a list of (character offset, page number), adds the page span of
+    each chunk to its metadata; metadata is copied onto every chunk.
+    """
+    doc_hash = document_hash(text)
+    chunks = [text[i:i+CHUNK_CHARS] for i in range(0, len(text), CHUNK_CHARS)]
+    if is_indexed(doc_hash, len(chunks)):
+        return doc_hash
+
+    ids = _chunk_ids(doc_hash, len(chunks))
+    for start in range(0, len(chunks), UPSERT_BATCH_SIZE):
+        batch = chunks[start:start + UPSERT_BATCH_SIZE]
+        collection.upsert(
+            ids=ids[start:start + UPSERT_BATCH_SIZE],
+            documents=batch,
+            embeddings=embedder.encode(batch).tolist(),
+            metadatas=[
+                _chunk_metadata(doc_hash, start + i, len(chunk), page_starts, metadata)
+                for i, chunk in enumerate(batch)
+            ]
+        )
+    return doc_hash
+
+def _chunk_metadata(doc_hash, index, length, page_starts, metadata):
+    chunk_metadata = {"doc": doc_hash, "chunk": index, **(metadata or {})}
+    if page_starts:
+        offset = index * CHUNK_CHARS
+        chunk_metadata["page_start"] = _page_at(page_starts, offset)
+        chunk_metadata["page_end"] = _page_at(page_starts, offset + length - 1)
+    return chunk_metadata
+
+def query_chunks(text, n_results=5, where=None):
+    """Return (document, metadata) pairs nearest to the text"""
+    query_emb = embedder.encode([text]).tolist()[0]
+    results = collection.query(query_embeddings=[query_emb], n_results=n_results, where=where)
+    return list(zip(results["documents"][0], results["metadatas"][0]))
 
-def retrieve_similar_chunks(text):
+def retrieve_similar_chunks(text, doc_hash=None, n_results=5):
     query_emb = embedder.encode([text]).tolist()[0]
-    results = collection.query(query_embeddings=[query_emb], n_results=5)
+    where = {"doc": doc_hash} if doc_hash else None
+    results = collection.query(query_embeddings=[query_emb], n_results=n_results, where=where)
     return "\n".join(results["documents"][0])
@@ -15,3 +15,21 @@ Create a structured summary with:
 
 Keep it concise, markdown-ready, and well-formatted.
 """
+
+MAP_PROMPT = """
+You are reading one section of an academic paper for a literature review.
+
+Section:
+{context}
+
+Summarize this section in concise bullet points covering its background, methods,
+findings and any quotable claims. Keep citations and numbers exactly as written.
+"""
+
+REDUCE_PROMPT = """
+Combine the following partial summaries of the same academic paper into one set of
+concise bullet points. Merge duplicates and keep citations and numbers exactly as written.
+
+Partial summaries:
+{context}
+"""
@@ -43,8 +43,11 @@ def _save_ideas(input: str) -> str:
 TOOLS = [
     Tool(name="Web Search", func=web_search, description="Useful for web info"),
     Tool(name="Niche Filter", func=niche_filter, description="Filter and score ideas by niche"),
-    Tool(name="Save Ideas", func=_save_ideas, description="Persist ideas with metadata to vector store"),
-    Tool(name="Vector Search", func=_vector_tool.run, description="Recall saved memory"),
+    Tool(name="Save Ideas", func=_save_ideas,
+         description='Persist ideas to vector memory. Input: JSON array [{"text": "..", '
+                     '"meta": {"niche": "..", "source": ".."}}]; set niche and source so Vector Search can filter'),
+    Tool(name="Vector Search", func=_vector_tool.run,
+         description='Recall saved memory. Input: query text, or JSON {"query": "..", "niche": "..", "source": ".."} to filter'),
     Tool(name="Research DB", func=ResearchTool().run, description="Search research context"),
 ]
 
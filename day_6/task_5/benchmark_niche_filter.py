@@ -0,0 +1,56 @@
+"""
+Compare the per-idea niche_filter loop with vectorized bulk scoring
+
+Usage:
+    python benchmark_niche_filter.py [n_ideas] [top_k]
+"""
+import random
+import sys
+import time
+from tools.niche_filter_tool import _compute_relevance, score_ideas
+
+NICHE = "sustainable home gardening for small urban apartments"
+WORDS = (NICHE.split() + ["budget", "tips", "guide", "beginner", "indoor", "vertical", "compost",
+                          "balcony", "herbs", "hydroponic", "review", "diy", "kitchen", "lighting"])
+
+
+def synthetic_ideas(n, seed=0):
+    rng = random.Random(seed)
+    return [" ".join(rng.choices(WORDS, k=rng.randint(4, 10))) for _ in range(n)]
+
+
+def loop_scoring(niche, ideas):
+    # The original path: re-tokenize the niche for every idea, then sort everything
+    scored = [{"idea": idea, "score": _compute_relevance(niche, idea)} for idea in ideas]
+    scored.sort(key=lambda x: x["score"], reverse=True)
+    return scored
+
+
+def timed(fn, *args, **kwargs):
+    started = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - started
+
+
+def main():
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    top_k = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    ideas = synthetic_ideas(n)
+
+    baseline, loop_seconds = timed(loop_scoring, NICHE, ideas)
+    bulk, bulk_seconds = timed(score_ideas, NICHE, ideas)
+    top, top_seconds = timed(score_ideas, NICHE, ideas, top_k=top_k)
+    tfidf, tfidf_seconds = timed(score_ideas, NICHE, ideas, weighting="tfidf", top_k=top_k)
+
+    assert bulk == baseline, "vectorized overlap scores differ from the loop"
+    assert top == baseline[:top_k], "top-k selection differs from the full sort"
+
+    print(f"{n} ideas")
+    print(f"{'loop':>14}: {loop_seconds:6.3f}s")
+    print(f"{'bulk':>14}: {bulk_seconds:6.3f}s ({loop_seconds / bulk_seconds:.1f}x)")
+    print(f"{f'bulk top-{top_k}':>14}: {top_seconds:6.3f}s ({loop_seconds / top_seconds:.1f}x)")
+    print(f"{f'tfidf top-{top_k}':>14}: {tfidf_seconds:6.3f}s, best: {tfidf[0]['idea']!r}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,14 @@
 from langchain.tools import tool
 import json
 import re
-from typing import List, Dict
+from typing import Callable, List, Dict, Optional
+import numpy as np
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
 
 
 def _tokenize(text: str) -> List[str]:
-    return re.findall(r"[a-z0-9]+", text.lower())
+    return _TOKEN_PATTERN.findall(text.lower())
 
 
 def _compute_relevance(niche: str, idea: str) -> int:
@@ -19,10 +22,82 @@ def _compute_relevance(niche: str, idea: str) -> int:
     return score
 
 
+def _presence_matrix(niche_tokens: List[str], ideas: List[str]) -> np.ndarray:
+    """ideas x niche-vocabulary matrix marking which niche terms each idea contains.
+
+    Only niche terms can contribute to a score, so the vocabulary is restricted to
+    them and the matrix stays small however many distinct words the ideas use.
+    """
+    column = {token: i for i, token in enumerate(niche_tokens)}
+    rows: List[int] = []
+    cols: List[int] = []
+    for row, idea in enumerate(ideas):
+        for token in set(_tokenize(idea)):
+            col = column.get(token)
+            if col is not None:
+                rows.append(row)
+                cols.append(col)
+    presence = np.zeros((len(ideas), len(niche_tokens)), dtype=bool)
+    presence[rows, cols] = True
+    return presence
+
+
+def score_ideas(
+    niche: str,
+    ideas: List[str],
+    weighting: str = "overlap",
+    top_k: Optional[int] = None,
+    embed: Optional[Callable[[List[str]], List[List[float]]]] = None,
+    embedding_weight: float = 0.0,
+) -> List[Dict]:
+    """Score every idea against the niche in one vectorized pass, best first.
+
+    weighting="overlap" matches _compute_relevance; "tfidf" weights niche terms by
+    their inverse document frequency across the ideas. With embed and a non-zero
+    embedding_weight, cosine similarity of the embeddings is blended in.
+    """
+    niche_tokens = sorted(set(_tokenize(niche)))
+    if not niche_tokens or not ideas:
+        return [{"idea": idea, "score": 0} for idea in ideas[:top_k]]
+
+    presence = _presence_matrix(niche_tokens, ideas)
+    if weighting == "overlap":
+        # Integer arithmetic reproduces int(100 * overlap / len(niche_tokens))
+        scores = (100 * presence.sum(axis=1)) // len(niche_tokens)
+    elif weighting == "tfidf":
+        df = presence.sum(axis=0)
+        idf = np.log((1 + len(ideas)) / (1 + df)) + 1
+        scores = 100 * (presence @ idf) / idf.sum()
+    else:
+        raise ValueError(f"Unknown weighting: {weighting}")
+
+    if embed is not None and embedding_weight > 0:
+        vectors = np.asarray(embed([niche] + list(ideas)), dtype="float32")
+        vectors /= np.clip(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12, None)
+        cosine = np.clip(vectors[1:] @ vectors[0], 0, 1)
+        scores = (1 - embedding_weight) * scores + embedding_weight * 100 * cosine
+    scores = np.asarray(scores, dtype=float)
+
+    # Partial selection for top-k: everything above the k-th score, then the earliest
+    # ideas tied with it, so the result matches a stable full sort
+    if top_k is not None and top_k < len(ideas):
+        if top_k <= 0:
+            return []
+        threshold = -np.partition(-scores, top_k - 1)[top_k - 1]
+        above = np.flatnonzero(scores > threshold)
+        tied = np.flatnonzero(scores == threshold)[:top_k - len(above)]
+        candidates = np.concatenate([above, tied])
+    else:
+        candidates = np.arange(len(ideas))
+    order = candidates[np.lexsort((candidates, -scores[candidates]))]
+    return [{"idea": ideas[i], "score": int(scores[i])} for i in order]
+
+
 @tool
 def niche_filter(input: str) -> str:
-    """Filter and score ideas by niche relevance. 
+    """Filter and score ideas by niche relevance.
     Input: JSON string {"niche": "<niche>", "ideas": ["idea1", "idea2", ...]}
+    Optional keys: "top_k" (int) and "weighting" ("overlap" or "tfidf").
     Output: Markdown list with relevance scores and a JSON payload for downstream use.
     """
     try:
@@ -32,14 +107,15 @@ def niche_filter(input: str) -> str:
         if not niche or not ideas:
             return "No niche or ideas provided. Provide JSON with 'niche' and 'ideas'."
 
-        scored: List[Dict] = []
-        for idea in ideas:
-            score = _compute_relevance(niche, idea)
-            scored.append({"idea": idea, "score": score})
-        scored.sort(key=lambda x: x["score"], reverse=True)
+        scored = score_ideas(
+            niche,
+            ideas,
+            weighting=payload.get("weighting", "overlap"),
+            top_k=payload.get("top_k"),
+        )
 
         md_lines = [f"- {item['idea']} — {item['score']}% relevance" for item in scored]
         json_blob = json.dumps({"niche": niche, "ideas": scored}, ensure_ascii=False)
         return "\n".join(md_lines) + "\n\nJSON:" + json_blob
     except Exception as e:
-        return f"niche_filter error: {e}"
\ No newline at end of file
+        return f"niche_filter error: {e}"
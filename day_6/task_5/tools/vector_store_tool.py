@@ -1,29 +1,113 @@
 import chromadb
 from chromadb.utils import embedding_functions
-from typing import List, Dict
+from typing import List, Dict, Optional
+import hashlib
+import json
+import os
+import numpy as np
+
+
+def _content_id(text: str) -> str:
+    # Same idea text -> same id, so repeated saves become upserts instead of errors
+    normalized = " ".join(text.lower().split())
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()[:32]
 
 
 class VectorSearchTool:
-    def __init__(self):
-        self.client = chromadb.Client()
+    def __init__(self, path: Optional[str] = None, duplicate_distance: float = 0.05, batch_size: int = 256):
+        self.client = chromadb.PersistentClient(path=path or os.getenv("AGENT_MEMORY_PATH", "agent_memory"))
         self.ef = embedding_functions.DefaultEmbeddingFunction()
-        self.collection = self.client.get_or_create_collection("agent_memory")
+        self.collection = self.client.get_or_create_collection(
+            "agent_memory", embedding_function=self.ef, metadata={"hnsw:space": "cosine"}
+        )
+        # Cosine distance under which a new idea counts as a near-duplicate
+        self.duplicate_distance = duplicate_distance
+        self.batch_size = batch_size
 
     def save(self, ideas: List[Dict]):
-        # ideas: [{"id": str, "text": str, "meta": {..}}]
+        # ideas: [{"id": str, "text": str, "meta": {"niche": .., "source": ..}}]; ids are derived from the text
         if not ideas:
             return "No ideas to save."
-        ids = [i["id"] for i in ideas]
-        docs = [i["text"] for i in ideas]
-        metas = [i.get("meta", {}) for i in ideas]
-        self.collection.add(ids=ids, documents=docs, metadatas=metas)
-        return f"Saved {len(ids)} ideas to vector store."
+        unique: Dict[str, Dict] = {}
+        empty = repeated = 0
+        for idea in ideas:
+            if not idea.get("text"):
+                empty += 1
+            elif _content_id(idea["text"]) in unique:
+                repeated += 1
+            else:
+                unique[_content_id(idea["text"])] = idea
+        metas = {i: {**(idea.get("meta") or {}), "idea_id": str(idea.get("id", i))} for i, idea in unique.items()}
+
+        # Ideas already in memory keep their vectors; only their metadata is refreshed
+        stored = self.collection.get(ids=list(unique), include=["metadatas"]) if unique else {"ids": []}
+        stored_metas = dict(zip(stored["ids"], stored.get("metadatas") or [{}] * len(stored["ids"])))
+        stored_ids = list(stored_metas)
+        for start in range(0, len(stored_ids), self.batch_size):
+            batch = stored_ids[start:start + self.batch_size]
+            self.collection.update(
+                ids=batch, metadatas=[{**(stored_metas[i] or {}), **metas[i]} for i in batch]
+            )
+
+        ids = [i for i in unique if i not in stored_metas]
+        docs = [unique[i]["text"] for i in ids]
+        embeddings = np.asarray(self.ef(docs), dtype="float32") if ids else np.zeros((0, 0), dtype="float32")
+        keep = self._novel(embeddings)
+        for start in range(0, len(keep), self.batch_size):
+            batch = keep[start:start + self.batch_size]
+            self.collection.upsert(
+                ids=[ids[i] for i in batch],
+                documents=[docs[i] for i in batch],
+                embeddings=embeddings[batch].tolist(),
+                metadatas=[metas[ids[i]] for i in batch],
+            )
+        return (
+            f"Saved {len(keep)} new ideas and updated metadata of {len(stored_ids)} existing ones "
+            f"({len(ids) - len(keep)} near-duplicates, {repeated} repeated in this batch, "
+            f"{empty} without text skipped)."
+        )
+
+    def _novel(self, embeddings: np.ndarray) -> List[int]:
+        """Indexes of ideas that are not near-duplicates of memory or of each other"""
+        if len(embeddings) == 0:
+            return []
+        threshold = 1 - self.duplicate_distance
+        stored_similarity = np.full(len(embeddings), -1.0)
+        if self.collection.count():
+            nearest = self.collection.query(
+                query_embeddings=embeddings.tolist(), n_results=1, include=["distances"]
+            )
+            for i, distances in enumerate(nearest["distances"]):
+                if distances:
+                    stored_similarity[i] = 1 - distances[0]
+
+        normalized = embeddings / np.clip(np.linalg.norm(embeddings, axis=1, keepdims=True), 1e-12, None)
+        keep: List[int] = []
+        for i in range(len(embeddings)):
+            if stored_similarity[i] >= threshold:
+                continue
+            if keep and float(np.max(normalized[keep] @ normalized[i])) >= threshold:
+                continue
+            keep.append(i)
+        return keep
 
     def run(self, query: str):
-        results = self.collection.query(query_texts=[query], n_results=5)
+        # Plain text, or JSON {"query": "...", "niche": "...", "source": "...", "k": 5}
+        try:
+            payload = json.loads(query)
+        except (TypeError, ValueError):
+            payload = None
+        if not isinstance(payload, dict):
+            payload = {"query": query}
+
+        filters = [{key: payload[key]} for key in ("niche", "source") if payload.get(key)]
+        where = filters[0] if len(filters) == 1 else ({"$and": filters} if filters else None)
+        results = self.collection.query(
+            query_texts=[payload.get("query", "")], n_results=int(payload.get("k", 5)), where=where
+        )
         docs = results.get("documents", [[]])[0]
         metas = results.get("metadatas", [[]])[0]
-        distances = results.get("distances", [[]])[0] or results.get("embeddings", [[]])[0]
+        distances = results.get("distances", [[]])[0]
         if not docs:
             return "No match in vector memory."
 
@@ -31,7 +115,7 @@ class VectorSearchTool:
         md_lines = []
         for idx, doc in enumerate(docs):
             meta = metas[idx] if idx < len(metas) else {}
-            # Chroma returns smaller distance = closer; map to 0..100
+            # Cosine distance: smaller = closer; map to 0..100
             dist = distances[idx] if idx < len(distances) else None
             if dist is not None:
                 rel = max(0, int(100 * (1 - min(1.0, float(dist)))))